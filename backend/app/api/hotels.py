@@ -0,0 +1,62 @@
+from flask import Blueprint, request, jsonify
+
+from app.core.hotel_index import mercator_to_lonlat
+from app.core.model_registry import registry
+from app.utils.validation import number_arg
+
+# Set up Flask blueprint
+hotels_bp = Blueprint('hotels', __name__)
+
+
+def _query_point(args):
+    """(lat, lon) from ``lat``/``lon``, or from Web-Mercator ``x``/``y`` as stored in Hotels.csv.
+
+    Raises ValueError if a coordinate is given but is not a finite number.
+    """
+    lat, lon = number_arg(args, "lat"), number_arg(args, "lon")
+    if lat is not None and lon is not None:
+        return lat, lon
+    x, y = number_arg(args, "x"), number_arg(args, "y")
+    if x is not None and y is not None:
+        lon, lat = mercator_to_lonlat(x, y)
+        return float(lat), float(lon)
+    return None
+
+
+# k nearest hotels to a point
+@hotels_bp.route("/nearest", methods=["GET"])
+def nearest_hotels():
+    try:
+        point = _query_point(request.args)
+        k = number_arg(request.args, "k", default=5, cast=int, minimum=0)
+        min_rooms = number_arg(request.args, "min_rooms", default=0, cast=int, minimum=0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if point is None:
+        return jsonify({"error": "lat and lon (or x and y) are required"}), 400
+
+    try:
+        hotels = registry.get("hotel_index").nearest(*point, k=k, min_rooms=min_rooms)
+        return jsonify({"hotels": hotels})
+    except Exception as e:
+        return jsonify({"error": f"Hotel lookup error: {str(e)}"}), 500
+
+
+# Hotels within a radius (metres) with at least min_rooms rooms
+@hotels_bp.route("/within", methods=["GET"])
+def hotels_within():
+    try:
+        point = _query_point(request.args)
+        radius = number_arg(request.args, "radius", minimum=0)
+        min_rooms = number_arg(request.args, "min_rooms", default=0, cast=int, minimum=0)
+        limit = number_arg(request.args, "limit", cast=int, minimum=0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if point is None or radius is None:
+        return jsonify({"error": "lat and lon (or x and y) and radius are required"}), 400
+
+    try:
+        hotels = registry.get("hotel_index").within(*point, radius_m=radius, min_rooms=min_rooms, limit=limit)
+        return jsonify({"hotels": hotels})
+    except Exception as e:
+        return jsonify({"error": f"Hotel lookup error: {str(e)}"}), 500
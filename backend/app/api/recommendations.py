@@ -1,29 +1,13 @@
 from flask import Blueprint, request, jsonify
-from pathlib import Path
-import pandas as pd
 
-from app.core.hybrid_recommender import hybrid_recommend
-from app.recommenders.collaborative_filtering import get_cf_recommendations
+from app.core.hotel_index import attach_nearby_hotels
+from app.core.hybrid_recommender import hybrid_recommend, recommend_bundle
+from app.core.model_registry import registry
+from app.core.result_cache import cache_stats
 from app.recommenders.content_based_filtering import get_cb_recommendations
 from app.recommenders.clustering_model import get_user_cluster_recommendations
-from app.recommenders.cf_model import load_cf_model
-from app.recommenders.content_model import load_cb_model
-from app.recommenders.clustering_model import load_clustering_model
-
-# Load models
-cf_model = load_cf_model('models/cf_model.h5')
-clustering_model = load_clustering_model('models/clustering_model.pkl')
-
-model_path = Path(__file__).resolve().parent.parent / 'models' / 'content_based_model.pkl'
-cb_data = load_cb_model(model_path)
-
-# Use dictionary keys
-cb_model = cb_data["tfidf_model"]
-cb_matrix = cb_data["tfidf_matrix"]
-cb_items_df = cb_data["hotels_df"]
-
-interactions_df = pd.read_csv('data/cleaned_interactions.csv')
-user_feats_df = pd.read_csv('data/user_features.csv')
+from app.utils.auth import request_user_id
+from app.utils.validation import number_arg
 
 # Set up Flask blueprint
 recommendations_bp = Blueprint('recommendations', __name__)
@@ -32,15 +16,24 @@ recommendations_bp = Blueprint('recommendations', __name__)
 @recommendations_bp.route("/cf", methods=["POST"])
 def cf_recommendations():
     data = request.get_json()
-    user_id = data.get("user_id")
+    user_id = request_user_id(data.get("user_id"))
     num_recommendations = data.get("num_recommendations", 10)
     
     try:
-        recommendations = get_cf_recommendations(user_id, num_recommendations, cf_model, interactions_df)
+        # Concurrent /cf requests are micro-batched into one forward pass
+        recommendations = registry.get("cf_recommender").recommend(user_id, num_recommendations)
         return jsonify({"recommendations": recommendations})
     except Exception as e:
         return jsonify({"error": f"CF Recommendation error: {str(e)}"}), 500
 
+# Batch size distribution and queue/inference times of the /cf micro-batcher
+@recommendations_bp.route("/cf/metrics", methods=["GET"])
+def cf_metrics():
+    cf_recommender = registry.get_if_loaded("cf_recommender")
+    if cf_recommender is None:
+        return jsonify({"loaded": False})
+    return jsonify(cf_recommender.metrics())
+
 # Content-Based Filtering recommendations
 @recommendations_bp.route("/cb", methods=["POST"])
 def cb_recommendations():
@@ -49,7 +42,7 @@ def cb_recommendations():
     num_recommendations = data.get("num_recommendations", 10)
     
     try:
-        recommendations = get_cb_recommendations(hotel_id, num_recommendations, cb_matrix, cb_items_df)
+        recommendations = get_cb_recommendations(hotel_id, num_recommendations, registry.get("content_based_model"))
         return jsonify({"recommendations": recommendations})
     except Exception as e:
         return jsonify({"error": f"CB Recommendation error: {str(e)}"}), 500
@@ -58,11 +51,11 @@ def cb_recommendations():
 @recommendations_bp.route("/cluster", methods=["POST"])
 def cluster_recommendations():
     data = request.get_json()
-    user_id = data.get("user_id")
+    user_id = request_user_id(data.get("user_id"))
     num_recommendations = data.get("num_recommendations", 10)
     
     try:
-        recommendations = get_user_cluster_recommendations(user_id, num_recommendations, clustering_model, user_feats_df)
+        recommendations = get_user_cluster_recommendations(user_id, num_recommendations, registry.get("cluster_tables"))
         return jsonify({"recommendations": recommendations})
     except Exception as e:
         return jsonify({"error": f"Cluster Recommendation error: {str(e)}"}), 500
@@ -77,15 +70,26 @@ def hybrid_recommendations():
     data = request.get_json()
 
     # Extract preferences from request, with default fallback if missing
-    user_id = data.get("user_id", 1)  
+    user_id = request_user_id(data.get("user_id", 1))
     top_n = data.get("top_n", 5)      
     weather = data.get("weather", None)
     activities = data.get("activities", None)
     accommodation_type = data.get("accommodation_type", None)
+    destination = data.get("destination", None)
     budget = data.get("budget", None)  
 
+    # Hotel-join parameters go straight to the spatial index, so reject bad values up front
     try:
-        print(f"Filtering data with preferences: weather={weather}, activities={activities}, accommodation_type={accommodation_type}, budget={budget}")
+        lat = number_arg(data, "lat")
+        lon = number_arg(data, "lon")
+        hotel_radius = number_arg(data, "hotel_radius", minimum=0)
+        min_rooms = number_arg(data, "min_rooms", default=0, minimum=0)
+        hotels_per_item = number_arg(data, "hotels_per_item", default=3, cast=int, minimum=0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        print(f"Filtering data with preferences: weather={weather}, activities={activities}, accommodation_type={accommodation_type}, destination={destination}, budget={budget}")
         
         # Call the hybrid recommender function with the user preferences
         recommendations = hybrid_recommend(
@@ -94,6 +98,7 @@ def hybrid_recommendations():
             weather=weather,
             activities=activities,
             accommodation_type=accommodation_type,
+            destination=destination,
             budget=budget  
         )
 
@@ -102,7 +107,51 @@ def hybrid_recommendations():
             print("No recommendations found based on the given preferences, providing fallback recommendations.")
             recommendations = ["Default Recommendation 1", "Default Recommendation 2"]
 
+        # Optional: join hotel-type recommendations against hotels near a point
+        if lat is not None and lon is not None and isinstance(recommendations, list):
+            attach_nearby_hotels(
+                [rec for rec in recommendations if isinstance(rec, dict)], registry.get("hotel_index"),
+                lat, lon, radius_m=hotel_radius, min_rooms=min_rooms, k=hotels_per_item,
+            )
+
         return jsonify({"recommendations": recommendations})
 
     except Exception as e:
         return jsonify({"error": f"Hybrid Recommendation error: {str(e)}"}), 500
+
+# Trip bundle: up to k items with the best total predicted rating within one total budget
+@recommendations_bp.route("/bundle", methods=["OPTIONS", "POST"])
+def bundle_recommendations():
+    # Handle CORS preflight
+    if request.method == "OPTIONS":
+        return "", 200
+
+    data = request.get_json()
+    user_id = request_user_id(data.get("user_id"))
+    budget = data.get("budget")
+    if user_id is None or budget is None:
+        return jsonify({"error": "user_id and budget are required"}), 400
+
+    try:
+        bundle = recommend_bundle(
+            user_id=user_id,
+            budget=budget,
+            weather=data.get("weather"),
+            activities=data.get("activities"),
+            accommodation_type=data.get("accommodation_type"),
+            destination=data.get("destination"),
+            k=data.get("k", 3),
+        )
+        return jsonify(bundle)
+    except Exception as e:
+        return jsonify({"error": f"Bundle Recommendation error: {str(e)}"}), 500
+
+# Model registry status (what is loaded and how long each artifact took)
+@recommendations_bp.route("/models", methods=["GET"])
+def model_status():
+    return jsonify(registry.status())
+
+# Hit/miss counters for the hybrid candidate and result caches
+@recommendations_bp.route("/cache", methods=["GET"])
+def cache_status():
+    return jsonify(cache_stats())
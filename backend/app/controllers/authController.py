@@ -2,7 +2,16 @@
 
 from flask import request, jsonify
 from app.services.user_service import register_user, authenticate_user, update_password
+from app.services.password_hasher import HasherBusyError, password_hasher
 from app.utils.jwt_util import generate_jwt
+from app.utils.auth import login_required, session_cache
+
+
+def _hasher_busy(error):
+    # Shed load quickly instead of queueing behind a login burst
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 # Register User
 def register():
@@ -14,7 +23,10 @@ def register():
     if not all([username, email, password]):
         return jsonify({'error': 'All fields are required.'}), 400
 
-    success, message = register_user(username, email, password)
+    try:
+        success, message = register_user(username, email, password)
+    except HasherBusyError as e:
+        return _hasher_busy(e)
     if success:
         return jsonify({'message': message}), 201
     else:
@@ -29,7 +41,10 @@ def login():
     if not all([email, password]):
         return jsonify({'error': 'Email and password are required.'}), 400
 
-    user = authenticate_user(email, password)
+    try:
+        user = authenticate_user(email, password)
+    except HasherBusyError as e:
+        return _hasher_busy(e)
     if user:
         token = generate_jwt(user["id"])
         return jsonify({
@@ -49,8 +64,21 @@ def reset_password():
     if not all([email, new_password]):
         return jsonify({'error': 'Email and new password are required.'}), 400
 
-    success, message = update_password(email, new_password)
+    try:
+        success, message = update_password(email, new_password)
+    except HasherBusyError as e:
+        return _hasher_busy(e)
     if success:
         return jsonify({'message': message}), 200
     else:
         return jsonify({'error': message}), 400
+
+# Password Hasher Metrics (operational data: the auth blueprint is public, so check the token here)
+@login_required
+def hasher_metrics():
+    return jsonify(password_hasher.metrics()), 200
+
+# Verified Session Cache Stats (behind a token like the hasher metrics)
+@login_required
+def session_cache_stats():
+    return jsonify(session_cache.stats()), 200
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from services.recommendation_service import recommend_items
+from app.services.recommendation_service import recommend_items
 
 router = APIRouter()
 
@@ -0,0 +1,267 @@
+import glob
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+
+# === Memory-Mapped Model Artifacts ===
+# An artifact is a directory holding one ``.npy`` file per numeric buffer and a
+# small JSON manifest describing how to reassemble them. Arrays are opened with
+# ``np.load(mmap_mode="r")``, so every worker process maps the same pages from
+# the OS page cache instead of unpickling a private copy.
+#
+# ``save_artifact`` takes a (possibly nested) dict of model parts, encoded as:
+#   - numpy arrays            -> one .npy file
+#   - DataFrames              -> one .npy file per column (strings as fixed-width
+#                                unicode plus a null mask); the index is not kept
+#   - scipy sparse matrices   -> CSR data / indices / indptr buffers
+#   - TfidfVectorizer         -> vocabulary terms + idf arrays, params in the manifest
+#   - LabelEncoder            -> classes array
+#   - MinMaxScaler            -> fitted statistics arrays
+#   - dicts                   -> nested entries
+#   - anything JSON-serialisable -> stored inline in the manifest
+# ``load_artifact`` returns the same structure with arrays memory-mapped.
+
+def is_artifact(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return [_json_value(v) for v in value]
+    if isinstance(value, list):
+        return [_json_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    return value
+
+
+def _write_array(directory, name, array):
+    array = np.asarray(array)
+    if array.dtype == object:
+        array = array.astype(str)
+    file_name = f"{name}.npy"
+    np.save(os.path.join(directory, file_name), np.ascontiguousarray(array), allow_pickle=False)
+    return file_name
+
+
+def _encode_frame(directory, name, df):
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        column_name = f"{name}.c{position}"
+        if series.dtype.kind in "biufcmM":
+            columns.append({"name": column, "kind": "numeric",
+                            "file": _write_array(directory, column_name, series.to_numpy())})
+            continue
+
+        nulls = series.isna().to_numpy()
+        values = series.where(~nulls, "").astype(str).to_numpy(dtype=str)
+        columns.append({
+            "name": column,
+            "kind": "string",
+            "file": _write_array(directory, column_name, values),
+            "nulls": _write_array(directory, f"{column_name}.nulls", nulls) if nulls.any() else None,
+        })
+    return {"type": "frame", "columns": columns}
+
+
+def _sklearn_type(value):
+    # Only values whose class comes from sklearn can be one of the sklearn parts,
+    # so other artifacts never pay for (or need) the sklearn import
+    module = type(value).__module__
+    if not module.startswith("sklearn."):
+        return None
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+    for kind, cls in (("tfidf", TfidfVectorizer), ("label_encoder", LabelEncoder), ("minmax_scaler", MinMaxScaler)):
+        if isinstance(value, cls):
+            return kind
+    return None
+
+
+def _encode(directory, name, value):
+    if isinstance(value, dict):
+        return {"type": "dict", "entries": {
+            str(key): _encode(directory, f"{name}.{key}" if name else str(key), item)
+            for key, item in value.items()
+        }}
+    if isinstance(value, np.ndarray):
+        return {"type": "array", "file": _write_array(directory, name, value)}
+    if isinstance(value, pd.DataFrame):
+        return _encode_frame(directory, name, value)
+    if sparse.issparse(value):
+        matrix = sparse.csr_matrix(value)
+        return {
+            "type": "csr",
+            "shape": list(matrix.shape),
+            "data": _write_array(directory, f"{name}.data", matrix.data),
+            "indices": _write_array(directory, f"{name}.indices", matrix.indices),
+            "indptr": _write_array(directory, f"{name}.indptr", matrix.indptr),
+        }
+    sklearn_type = _sklearn_type(value)
+    if sklearn_type == "tfidf":
+        terms = sorted(value.vocabulary_, key=value.vocabulary_.get)
+        params = {
+            key: _json_value(param) for key, param in value.get_params().items()
+            if key not in ("dtype", "vocabulary") and not callable(param)
+        }
+        return {
+            "type": "tfidf",
+            "params": params,
+            "vocabulary": _write_array(directory, f"{name}.vocabulary", np.array(terms, dtype=str)),
+            "idf": _write_array(directory, f"{name}.idf", value.idf_),
+        }
+    if sklearn_type == "label_encoder":
+        return {"type": "label_encoder", "classes": _write_array(directory, f"{name}.classes", value.classes_)}
+    if sklearn_type == "minmax_scaler":
+        return {
+            "type": "minmax_scaler",
+            "feature_range": _json_value(value.feature_range),
+            "n_samples_seen": _json_value(value.n_samples_seen_),
+            "arrays": {
+                attr: _write_array(directory, f"{name}.{attr}", getattr(value, f"{attr}_"))
+                for attr in ("min", "scale", "data_min", "data_max", "data_range")
+            },
+        }
+
+    value = _json_value(value)
+    try:
+        json.dumps(value)
+    except TypeError:
+        raise TypeError(f"Cannot store '{name}' of type {type(value).__name__} in a model artifact")
+    return {"type": "json", "value": value}
+
+
+def save_artifact(path, contents, kind=None):
+    """Write ``contents`` as an artifact directory at ``path``.
+
+    Each save writes a new ``<path>.v<n>`` directory, and ``path`` is a
+    symlink switched to it with a single ``os.replace``, so ``path`` always
+    names a complete artifact. The previous version is kept for readers that
+    resolved the link just before the switch; older versions are removed.
+    An artifact saved before versioning is moved aside on its first re-save,
+    which briefly leaves ``path`` missing.
+    Processes that mapped a removed version keep their (unlinked) pages.
+    """
+    path = os.path.abspath(path)
+    version_path = f"{path}.v{time.time_ns()}-{os.getpid()}"
+    os.makedirs(version_path)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "kind": kind,
+        "contents": _encode(version_path, "", contents),
+    }
+    with open(os.path.join(version_path, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = os.path.realpath(path) if os.path.exists(path) else None
+    if previous is not None and not os.path.islink(path):
+        # Written before versioning: move it aside once so the symlink can take its place
+        previous = f"{path}.v0-{os.getpid()}"
+        os.rename(path, previous)
+
+    link_path = f"{version_path}.link"
+    os.symlink(os.path.basename(version_path), link_path)
+    os.replace(link_path, path)
+
+    # Version names sort by creation time; newer ones may still be being written by another save
+    if previous is not None:
+        for stale in glob.glob(f"{glob.escape(path)}.v*"):
+            if os.path.isdir(stale) and stale < previous:
+                shutil.rmtree(stale, ignore_errors=True)
+    return path
+
+
+def _decode_frame(directory, entry, mmap_mode):
+    columns = {}
+    for column in entry["columns"]:
+        values = np.load(os.path.join(directory, column["file"]), mmap_mode=mmap_mode)
+        if column["kind"] == "string":
+            values = values.astype(object)
+            if column.get("nulls"):
+                values[np.load(os.path.join(directory, column["nulls"]))] = np.nan
+        columns[column["name"]] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _decode(directory, entry, mmap_mode):
+    def load(file_name):
+        return np.load(os.path.join(directory, file_name), mmap_mode=mmap_mode)
+
+    kind = entry["type"]
+    if kind == "dict":
+        return {key: _decode(directory, item, mmap_mode) for key, item in entry["entries"].items()}
+    if kind == "array":
+        return load(entry["file"])
+    if kind == "frame":
+        return _decode_frame(directory, entry, mmap_mode)
+    if kind == "csr":
+        return sparse.csr_matrix(
+            (load(entry["data"]), load(entry["indices"]), load(entry["indptr"])),
+            shape=tuple(entry["shape"]), copy=False,
+        )
+    if kind == "tfidf":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        params = dict(entry["params"])
+        if "ngram_range" in params:
+            params["ngram_range"] = tuple(params["ngram_range"])
+        terms = np.load(os.path.join(directory, entry["vocabulary"]))
+        vectorizer = TfidfVectorizer(**params, vocabulary={term: i for i, term in enumerate(terms.tolist())})
+        vectorizer.idf_ = np.array(load(entry["idf"]))
+        return vectorizer
+    if kind == "label_encoder":
+        from sklearn.preprocessing import LabelEncoder
+        encoder = LabelEncoder()
+        encoder.classes_ = np.load(os.path.join(directory, entry["classes"]))
+        return encoder
+    if kind == "minmax_scaler":
+        from sklearn.preprocessing import MinMaxScaler
+        scaler = MinMaxScaler(feature_range=tuple(entry["feature_range"]))
+        for attr, file_name in entry["arrays"].items():
+            setattr(scaler, f"{attr}_", np.load(os.path.join(directory, file_name)))
+        scaler.n_samples_seen_ = entry["n_samples_seen"]
+        scaler.n_features_in_ = len(scaler.min_)
+        return scaler
+    if kind == "json":
+        return entry["value"]
+    raise ValueError(f"Unknown artifact entry type: {kind}")
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version in {path}: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_artifact(path, mmap_mode="r"):
+    """Load an artifact written by ``save_artifact`` with its arrays memory-mapped."""
+    # Resolve the symlink once so every file comes from the same version
+    path = os.path.realpath(path)
+    manifest = read_manifest(path)
+    return _decode(path, manifest["contents"], mmap_mode)
+
+
+def save_frame(path, df):
+    """Store a DataFrame as a columnar artifact (one ``.npy`` per column)."""
+    return save_artifact(path, {"frame": df}, kind="frame")
+
+
+def load_frame(path, mmap_mode="r"):
+    """Read a frame saved by ``save_frame``, or a CSV file as a fallback."""
+    if is_artifact(path):
+        return load_artifact(path, mmap_mode)["frame"]
+    return pd.read_csv(path)
@@ -0,0 +1,195 @@
+import heapq
+import os
+import time
+
+import numpy as np
+
+# Price buckets across the budget for the DP, and the largest DP table (items x k x buckets) it may build
+BUNDLE_DP_RESOLUTION = int(os.getenv("BUNDLE_DP_RESOLUTION", 1000))
+BUNDLE_DP_MAX_CELLS = int(os.getenv("BUNDLE_DP_MAX_CELLS", 20_000_000))
+# Wall-clock cap (seconds) for the branch-and-bound search before the best bundle so far is returned
+BUNDLE_TIME_LIMIT = float(os.getenv("BUNDLE_TIME_LIMIT", 0.05))
+# Fewer buckets than this make too rough a starting bundle for the search to be worth the DP
+MIN_COARSE_BUCKETS = 32
+
+
+# === Budget-Constrained Bundle Optimizer ===
+# Picks at most k items maximising the sum of their scores (predicted ratings)
+# with the sum of their prices within the budget: a 0/1 knapsack with a
+# cardinality limit.
+
+
+def _undominated(prices, scores, k):
+    """Rows that can appear in an optimal bundle.
+
+    An item is dropped when k other items are each no more expensive and
+    score at least as well: an optimal bundle holds at most k - 1 other
+    items, so one of those k is free to replace it at no loss. What is left
+    is a price/score frontier, typically a small fraction of the candidates.
+    """
+    order = np.lexsort((-scores, prices))
+    keep = []
+    best = []  # min-heap of the k best scores among cheaper rows
+    for row, score in zip(order.tolist(), scores[order].tolist()):
+        if len(best) < k or score > best[0]:
+            keep.append(row)
+        if len(best) < k:
+            heapq.heappush(best, score)
+        elif score > best[0]:
+            heapq.heapreplace(best, score)
+    return np.asarray(keep, dtype=np.int64)
+
+
+def _knapsack_dp(costs, scores, capacity, k):
+    """Exact DP over integer costs; returns the chosen positions.
+
+    ``dp[j, c]`` is the best score of exactly j items costing at most c. Each
+    item updates the whole (j, c) table in one vectorised step, and ``take``
+    records where it did so the bundle can be traced back.
+    """
+    n = len(costs)
+    dp = np.full((k + 1, capacity + 1), -np.inf)
+    dp[0] = 0.0
+    take = np.zeros((n, k, capacity + 1), dtype=bool)
+    for i in range(n):
+        w = int(costs[i])
+        if w > capacity:
+            continue
+        # Right-hand side is evaluated on the table before this item, so each item is used once
+        candidate = dp[:-1, :capacity + 1 - w] + scores[i]
+        better = candidate > dp[1:, w:]
+        dp[1:, w:] = np.where(better, candidate, dp[1:, w:])
+        take[i, :, w:] = better
+
+    j, c = int(np.argmax(dp[:, capacity])), capacity
+    chosen = []
+    for i in range(n - 1, -1, -1):
+        if j == 0:
+            break
+        if take[i, j - 1, c]:
+            chosen.append(i)
+            c -= int(costs[i])
+            j -= 1
+    return chosen[::-1]
+
+
+def _branch_and_bound(prices, scores, budget, k, time_limit, incumbent=()):
+    """Depth-first search over bundles, best-scoring items first.
+
+    A partial bundle is bounded by its score plus the lesser of the next
+    best ``k - size`` scores and the remaining budget spent at the best
+    score-per-price ratio still available, so whole subtrees are cut as
+    soon as they cannot beat the incumbent. Returns (positions, finished);
+    when ``time_limit`` runs out the best bundle found so far is returned
+    with finished=False.
+    """
+    order = np.lexsort((prices, -scores))
+    prices, scores = prices[order], scores[order]
+    n = len(order)
+    prefix = np.concatenate([[0.0], np.cumsum(scores)]).tolist()
+    # Cheapest price and best score per price from each position on
+    suffix_min = np.minimum.accumulate(prices[::-1])[::-1].tolist()
+    suffix_density = np.maximum.accumulate((scores / np.maximum(prices, 1e-9))[::-1])[::-1].tolist()
+    price_list, score_list = prices.tolist(), scores.tolist()
+    deadline = time.perf_counter() + time_limit
+
+    # Start from the given bundle (or a greedy one: best scores first, skipping what no longer fits)
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+    best_bundle = sorted(position[list(incumbent)].tolist())
+    if not best_bundle:
+        remaining = budget
+        for t in range(n):
+            if len(best_bundle) == k:
+                break
+            if price_list[t] <= remaining:
+                best_bundle.append(t)
+                remaining -= price_list[t]
+    best_score = sum(score_list[t] for t in best_bundle)
+
+    nodes = 0
+    finished = True
+    stack = [(0, [], budget, 0.0)]
+    while stack:
+        start, bundle, remaining, score = stack.pop()
+        slots = k - len(bundle)
+        children = []
+        for t in range(start, n):
+            bound = min(prefix[min(t + slots, n)] - prefix[t], remaining * suffix_density[t])
+            if score + bound <= best_score or remaining < suffix_min[t]:
+                break
+            if price_list[t] > remaining:
+                continue
+            new_score = score + score_list[t]
+            if new_score > best_score:
+                best_score, best_bundle = new_score, bundle + [t]
+            if slots > 1:
+                children.append((t + 1, bundle + [t], remaining - price_list[t], new_score))
+
+        # Visit the highest-scoring branch next
+        stack.extend(reversed(children))
+        nodes += 1
+        if nodes % 256 == 0 and time.perf_counter() > deadline:
+            finished = False
+            break
+
+    return order[best_bundle].tolist(), finished
+
+
+def optimize_bundle(prices, scores, budget, k=3, resolution=BUNDLE_DP_RESOLUTION,
+                    max_dp_cells=BUNDLE_DP_MAX_CELLS, time_limit=BUNDLE_TIME_LIMIT):
+    """Choose at most ``k`` items maximising total score with total price <= ``budget``.
+
+    Candidates are first cut to the undominated frontier. The DP then runs
+    over prices rounded up to ``budget / resolution`` buckets (so its bundle
+    is always within budget, and exact when prices are whole numbers and
+    the budget is at most ``resolution``). If the DP table would exceed
+    ``max_dp_cells``, a time-capped branch-and-bound on the exact prices,
+    seeded by a DP over fewer buckets, is used instead. Items with a
+    missing price or non-positive score are never chosen.
+
+    Returns a dict with the chosen row positions (highest score first),
+    their total score and price, the remaining budget, the method used and
+    whether the result is known to be optimal.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    budget = float(budget)
+
+    eligible = np.flatnonzero(np.isfinite(prices) & (prices <= budget) & np.isfinite(scores) & (scores > 0))
+    rows = eligible[_undominated(prices[eligible], scores[eligible], k)] if k > 0 and len(eligible) else eligible[:0]
+
+    if len(rows) == 0:
+        chosen, method, optimal = [], "empty", True
+    elif not np.isfinite(budget):
+        # No price cap: the k best scores
+        chosen, method, optimal = rows[np.argsort(-scores[rows], kind="stable")[:k]].tolist(), "top_k", True
+    else:
+        whole = np.all(prices[rows] == np.round(prices[rows]))
+        bucket = max(1.0, np.ceil(budget / resolution)) if whole else max(budget / resolution, 1e-9)
+        capacity = int(np.floor(budget / bucket + 1e-9))
+        if len(rows) * k * (capacity + 1) <= max_dp_cells:
+            # Rounding costs up keeps every DP bundle within the real budget
+            costs = np.ceil(prices[rows] / bucket - 1e-9).astype(np.int64)
+            chosen = rows[_knapsack_dp(costs, scores[rows], capacity, k)].tolist()
+            method, optimal = "dp", bool(whole and bucket == 1.0)
+        else:
+            # A DP on as many buckets as fit seeds the search with a near-optimal bundle
+            coarse = max_dp_cells // (len(rows) * k) - 1
+            incumbent = []
+            if coarse >= MIN_COARSE_BUCKETS:
+                costs = np.ceil(prices[rows] * coarse / budget - 1e-9).astype(np.int64)
+                incumbent = _knapsack_dp(costs, scores[rows], coarse, k)
+            positions, optimal = _branch_and_bound(prices[rows], scores[rows], budget, k, time_limit, incumbent)
+            chosen, method = rows[positions].tolist(), "branch_and_bound"
+
+    chosen.sort(key=lambda row: -scores[row])
+    total_price = float(prices[chosen].sum()) if chosen else 0.0
+    return {
+        "indices": chosen,
+        "total_score": float(scores[chosen].sum()) if chosen else 0.0,
+        "total_price": total_price,
+        "remaining_budget": budget - total_price,
+        "method": method,
+        "optimal": optimal,
+    }
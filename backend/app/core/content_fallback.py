@@ -0,0 +1,59 @@
+import threading
+from functools import lru_cache
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import linear_kernel
+
+
+# === Cached Content-Based Fallback ===
+class ContentFallback:
+    """TF-IDF cold-start ranker fitted once over the catalog and reused read-only.
+
+    The vectorizer and sparse matrix are fitted on first use; afterwards each
+    request only transforms its activity query (memoised in an LRU keyed by the
+    normalised query) and takes one sparse product against the matrix.
+    """
+
+    def __init__(self, items_df, text_columns=("activities", "destination"), query_cache_size=1024):
+        self.items_df = items_df
+        self.text_columns = text_columns
+        self.tfidf = None
+        self.tfidf_matrix = None
+        self._lock = threading.Lock()
+        self._query_vector = lru_cache(maxsize=query_cache_size)(self._compute_query_vector)
+
+    def _ensure_fitted(self):
+        if self.tfidf_matrix is not None:
+            return
+        with self._lock:
+            if self.tfidf_matrix is not None:
+                return
+
+            text_column = next((col for col in self.text_columns if col in self.items_df.columns), None)
+            if text_column is None:
+                raise ValueError(f"No suitable text column ({' or '.join(self.text_columns)}) found.")
+            if text_column != self.text_columns[0]:
+                print(f"Fallback to '{text_column}' as '{self.text_columns[0]}' is missing.")
+
+            tfidf = TfidfVectorizer(stop_words="english")
+            tfidf_matrix = tfidf.fit_transform(self.items_df[text_column].fillna(""))
+            self.tfidf = tfidf
+            self.tfidf_matrix = tfidf_matrix
+
+    @staticmethod
+    def normalize_query(activities):
+        return " ".join(a.strip().lower() for a in activities.split(",")) if activities else ""
+
+    def _compute_query_vector(self, query):
+        return self.tfidf.transform([query])
+
+    def similarities(self, activities):
+        self._ensure_fitted()
+        query_vec = self._query_vector(self.normalize_query(activities))
+        return linear_kernel(query_vec, self.tfidf_matrix).ravel()
+
+    def recommend(self, activities, budget):
+        similarity = self.similarities(activities)
+        within_budget = (self.items_df["price"] <= budget).to_numpy()
+        fallback_df = self.items_df[within_budget].assign(similarity=similarity[within_budget])
+        return fallback_df.sort_values(by="similarity", ascending=False)
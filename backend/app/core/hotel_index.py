@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# Web-Mercator (EPSG:3857) sphere radius and the mean Earth radius used for distances
+MERCATOR_RADIUS_M = 6378137.0
+EARTH_RADIUS_M = 6371008.8
+
+# Hotels.csv column -> field name in query results
+HOTEL_FIELDS = {"NAME": "name", "ADDRESS": "address", "PHONE": "phone", "WEB_URL": "web_url",
+                "ZIPCODE": "zipcode", "NUMROOMS": "num_rooms"}
+
+
+def mercator_to_lonlat(x, y):
+    lon = np.degrees(np.asarray(x, dtype=np.float64) / MERCATOR_RADIUS_M)
+    lat = np.degrees(2 * np.arctan(np.exp(np.asarray(y, dtype=np.float64) / MERCATOR_RADIUS_M)) - np.pi / 2)
+    return lon, lat
+
+
+def _to_ecef(lat, lon):
+    # Points on a sphere of EARTH_RADIUS_M; straight-line (chord) distance grows monotonically with arc length
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS_M * np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord_to_arc(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(chord / (2 * EARTH_RADIUS_M), 1.0))
+
+
+def _arc_to_chord(arc):
+    return 2 * EARTH_RADIUS_M * np.sin(np.minimum(arc, np.pi * EARTH_RADIUS_M) / (2 * EARTH_RADIUS_M))
+
+
+# === Hotel Spatial Index ===
+class HotelIndex:
+    """KD-tree over hotel locations for nearest-k and radius queries.
+
+    Hotels.csv stores Web-Mercator ``X``/``Y``; they are converted to points on
+    the Earth's sphere once at load time, so query distances are great-circle
+    metres wherever the hotels are (Mercator metres are stretched by
+    1/cos(latitude)). Attributes are held as columnar arrays and a query only
+    materialises the rows it returns. Hotels with an unknown room count never
+    satisfy ``min_rooms > 0``.
+    """
+
+    def __init__(self, hotels_df):
+        self.size = len(hotels_df)
+        self.lon, self.lat = mercator_to_lonlat(hotels_df["X"], hotels_df["Y"])
+        self.rooms = hotels_df["NUMROOMS"].to_numpy(dtype=np.float64) if "NUMROOMS" in hotels_df else np.full(self.size, np.nan)
+        self.columns = {
+            field: hotels_df[column].to_numpy(dtype=object)
+            for column, field in HOTEL_FIELDS.items() if column in hotels_df.columns
+        }
+        self.tree = cKDTree(_to_ecef(self.lat, self.lon))
+
+    @classmethod
+    def from_csv(cls, path):
+        # The published file starts with a UTF-8 byte-order mark
+        return cls(pd.read_csv(path, encoding="utf-8-sig"))
+
+    def _records(self, rows, distances):
+        records = []
+        for row, distance in zip(rows.tolist(), distances.tolist()):
+            record = {field: None if pd.isna(values[row]) else values[row] for field, values in self.columns.items()}
+            record["num_rooms"] = None if np.isnan(self.rooms[row]) else int(self.rooms[row])
+            if record.get("zipcode") is not None:
+                record["zipcode"] = str(record["zipcode"])
+            record.update({"lat": float(self.lat[row]), "lon": float(self.lon[row]), "distance_m": round(distance, 1)})
+            records.append(record)
+        return records
+
+    def nearest(self, lat, lon, k=5, min_rooms=0):
+        """The ``k`` hotels closest to (lat, lon) with at least ``min_rooms`` rooms, nearest first."""
+        k = min(int(k), self.size)
+        if k <= 0:
+            return []
+        point = _to_ecef(lat, lon)[0]
+        eligible = self.rooms >= min_rooms if min_rooms > 0 else None
+
+        # Widen the search until k eligible hotels are among the neighbours (or all hotels are)
+        n_probe = k
+        while True:
+            chords, rows = self.tree.query(point, k=n_probe)
+            chords, rows = np.atleast_1d(chords), np.atleast_1d(rows)
+            if eligible is not None:
+                keep = eligible[rows]
+                chords, rows = chords[keep], rows[keep]
+            if len(rows) >= k or n_probe >= self.size:
+                break
+            n_probe = min(n_probe * 4, self.size)
+
+        return self._records(rows[:k], _chord_to_arc(chords[:k]))
+
+    def within(self, lat, lon, radius_m, min_rooms=0, limit=None):
+        """Hotels within ``radius_m`` metres of (lat, lon) with at least ``min_rooms`` rooms, nearest first."""
+        point = _to_ecef(lat, lon)[0]
+        rows = np.asarray(self.tree.query_ball_point(point, _arc_to_chord(float(radius_m))), dtype=np.int64)
+        if min_rooms > 0:
+            rows = rows[self.rooms[rows] >= min_rooms]
+
+        # Distances for the survivors in one vectorised pass
+        chords = np.linalg.norm(self.tree.data[rows] - point, axis=1)
+        order = np.argsort(chords, kind="stable")[:limit]
+        return self._records(rows[order], _chord_to_arc(chords[order]))
+
+
+# === Recommendation Join ===
+def attach_nearby_hotels(recommendations, hotel_index, lat, lon, radius_m=None, min_rooms=0, k=3):
+    """Add a ``nearby_hotels`` list to every hotel-type recommendation.
+
+    With ``radius_m`` the list holds up to ``k`` hotels inside the radius,
+    otherwise the ``k`` nearest. Hotels are the same for every recommendation
+    (they depend only on the point), so the lookup runs once.
+    """
+    if radius_m is None:
+        hotels = hotel_index.nearest(lat, lon, k, min_rooms)
+    else:
+        hotels = hotel_index.within(lat, lon, radius_m, min_rooms, limit=k)
+
+    for rec in recommendations:
+        if "hotel" in str(rec.get("accommodation_type", "")).lower():
+            rec["nearby_hotels"] = hotels
+    return recommendations
@@ -1,156 +1,234 @@
-import pandas as pd
-import pickle
 import os
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# === Path Setup ===
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "..", "data")  
-MODELS_DIR = os.path.join(BASE_DIR, "..", "models")
-
-# Correct the file names here
-RATINGS_PATH = os.path.join(DATA_DIR, "cleaned_ratings_data.csv")  
-DESTINATIONS_PATH = os.path.join(DATA_DIR, "cleaned_feature_hybrid_dataset.csv")  
-MODEL_PATH = os.path.join(MODELS_DIR, "svd_model.pkl")  
-RECOMMENDATION_HISTORY_FILE = os.path.join(DATA_DIR, "recommendation_history.csv")  
-
-# === Load Data ===
-print(f"Data directory: {DATA_DIR}")
-print(f"Ratings file path: {RATINGS_PATH}")
-ratings_df = pd.read_csv(RATINGS_PATH)
-destinations_df = pd.read_csv(DESTINATIONS_PATH)
-
-# === Load Collaborative Filtering Model ===
-if not os.path.exists(MODEL_PATH):
-    raise FileNotFoundError(f"SVD model not found at {MODEL_PATH}")
-
-with open(MODEL_PATH, "rb") as f:
-    svd_model = pickle.load(f)
-
-# === Hybrid Recommender ===
-def hybrid_recommend(user_id, budget, weather=None, activities=None, accommodation_type=None, top_n=10):
-    filtered_df = destinations_df.copy()
-
-    # Weather filter
-    if "weather" in filtered_df.columns and weather:
-        filtered_df = filtered_df[filtered_df["weather"].str.lower() == weather.lower()]
-    elif weather:
-        print("Weather column not found, skipping weather filter.")
-
-    # Activities filter
-    if "activities" in filtered_df.columns and activities:
-        activity_list = [a.strip().lower() for a in activities.split(",")]
-        filtered_df = filtered_df[filtered_df["activities"].apply(lambda x: any(act in str(x).lower() for act in activity_list))]
-    elif activities:
-        print("Activities column not found, skipping activities filter.")
-
-    # Accommodation type filter
-    if accommodation_type:
-        if "accommodation_type" in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df["accommodation_type"].str.lower() == accommodation_type.lower()]
+
+import numpy as np
+
+from app.core.bundle_optimizer import optimize_bundle
+from app.core.model_registry import registry
+from app.core.result_cache import candidate_cache, result_cache, filter_key
+from app.services.history_service import history_sink
+
+# Above this many candidate rows, SVD ranking goes through top-K retrieval instead of scoring every row
+RETRIEVAL_MIN_CANDIDATES = int(os.getenv("RETRIEVAL_MIN_CANDIDATES", 50000))
+
+
+# === Hybrid Recommender Engine ===
+class HybridRecommender:
+    """The one hybrid recommendation engine shared by every blueprint.
+
+    All state (catalog index, interactions, SVD scorer, content fallback) is
+    held once per process in the model registry; the engine only adds the
+    filtering, ranking and history logic on top of it.
+    """
+
+    def __init__(self, models):
+        self.models = models
+
+    # --- Shared state ---
+    @property
+    def item_index(self):
+        return self.models.get("item_index")
+
+    @property
+    def interactions(self):
+        return self.models.get("interaction_index")
+
+    @property
+    def scorer(self):
+        return self.models.get("svd_scorer")
+
+    @property
+    def vector_index(self):
+        return self.models.get("svd_vector_index")
+
+    @property
+    def content_fallback(self):
+        return self.models.get("content_fallback")
+
+    # --- Public API ---
+    def recommend(self, user_id, budget=None, weather=None, activities=None, accommodation_type=None,
+                  destination=None, top_n=10):
+        # No budget means no price cap
+        budget = float("inf") if budget is None else float(budget)
+
+        # Ranked results are cached per user; history is still recorded on every call
+        cache_key = ("hybrid", user_id, filter_key(weather, activities, accommodation_type, destination), budget, top_n)
+        top_recommendations = result_cache.get(cache_key)
+        if top_recommendations is None:
+            top_recommendations = self._rank(user_id, budget, weather, activities, accommodation_type, destination, top_n)
+            result_cache.set(cache_key, top_recommendations, tag=user_id)
+
+        if isinstance(top_recommendations, dict):
+            return dict(top_recommendations)
+
+        self.save_history(user_id, top_recommendations)
+        return [dict(rec) for rec in top_recommendations]
+
+    def recommend_bundle(self, user_id, budget, weather=None, activities=None, accommodation_type=None,
+                         destination=None, k=3):
+        """Up to ``k`` distinct items with the highest total predicted rating whose prices fit the budget together."""
+        budget = float(budget)
+        candidates_df = self.item_index.take(
+            self.filter_candidates(budget, weather, activities, accommodation_type, destination)
+        )
+        candidates_df = candidates_df[~candidates_df["item_id"].isin(self.interactions.items_of(user_id))]
+
+        # An item is offered once, at its cheapest catalog price
+        candidates_df = candidates_df.sort_values("price", kind="stable").drop_duplicates("item_id")
+        if candidates_df.empty:
+            return {"message": "No recommendations found based on provided filters."}
+
+        predicted = self.scorer.score(user_id, candidates_df["item_id"])
+        result = optimize_bundle(candidates_df["price"].to_numpy(), predicted, budget, k)
+        bundle = candidates_df.iloc[result["indices"]].assign(predicted_rating=predicted[result["indices"]])
+        bundle = bundle.to_dict(orient="records")
+        self.save_history(user_id, bundle)
+
+        return {
+            "bundle": bundle,
+            "total_price": result["total_price"],
+            "total_predicted_rating": result["total_score"],
+            "remaining_budget": result["remaining_budget"],
+            "method": result["method"],
+            "optimal": result["optimal"],
+        }
+
+    def filter_candidates(self, budget, weather=None, activities=None, accommodation_type=None, destination=None):
+        # The user-independent filter bitmap is cached; the budget cut is a binary search on top of it
+        item_index = self.item_index
+        cache_key = (id(item_index), filter_key(weather, activities, accommodation_type, destination))
+        candidates = candidate_cache.get(cache_key)
+        if candidates is None:
+            candidates = item_index.all()
+
+            # Weather filter
+            if weather:
+                if item_index.has_column("weather"):
+                    candidates &= item_index.equals("weather", weather)
+                else:
+                    print("Weather column not found, skipping weather filter.")
+
+            # Activities filter
+            if activities:
+                if item_index.has_column("activities"):
+                    activity_list = [a.strip().lower() for a in activities.split(",")]
+                    candidates &= item_index.activities_any(activity_list)
+                else:
+                    print("Activities column not found, skipping activities filter.")
+
+            # Accommodation type filter
+            if accommodation_type:
+                if item_index.has_column("accommodation_type"):
+                    candidates &= item_index.equals("accommodation_type", accommodation_type)
+                else:
+                    print("Accommodation type column not found, skipping filter.")
+
+            # Destination filter
+            if destination:
+                if item_index.has_column("destination"):
+                    candidates &= item_index.equals("destination", destination)
+                else:
+                    print("Destination column not found, skipping destination filter.")
+
+            candidate_cache.set(cache_key, candidates)
+
+        # Budget filter
+        return candidates & item_index.price_at_most(budget)
+
+    def _rank(self, user_id, budget, weather, activities, accommodation_type, destination, top_n):
+        filtered_df = self.item_index.take(
+            self.filter_candidates(budget, weather, activities, accommodation_type, destination)
+        )
+
+        # Exclude items the user has already interacted with
+        user_items = self.interactions.items_of(user_id)
+        filtered_df = filtered_df[~filtered_df["item_id"].isin(user_items)]
+
+        if filtered_df.empty:
+            return {"message": "No recommendations found based on provided filters."}
+
+        # Collaborative filtering (SVD) for users with interactions
+        if len(user_items) > 0:
+            try:
+                sorted_df = self._rank_by_svd(user_id, filtered_df, top_n)
+            except Exception as e:
+                print("⚠️ Collaborative filtering failed:", e)
+                sorted_df = filtered_df
         else:
-            print("Accommodation type column not found, skipping filter.")
-
-    # Budget filter
-    filtered_df = filtered_df[filtered_df["price"] <= budget]
-
-    # Exclude items already rated by user
-    user_items = ratings_df[ratings_df["user_id"] == user_id]["item_id"].unique()
-    filtered_df = filtered_df[~filtered_df["item_id"].isin(user_items)]
-
-    if filtered_df.empty:
-        return {"message": "No recommendations found based on provided filters."}
-
-    # Collaborative Filtering
-    if len(user_items) > 0:
-        try:
-            filtered_df["predicted_rating"] = filtered_df["item_id"].apply(
-                lambda item_id: svd_model.predict(user_id, item_id).est
-            )
-            sorted_df = filtered_df.sort_values(by="predicted_rating", ascending=False)
-        except Exception as e:
-            print("⚠️ Collaborative filtering failed:", e)
-            sorted_df = filtered_df
-    else:
-        # Fallback to content-based
-        sorted_df = fallback_content_based(activities, budget, top_n)
+            # Cold start: content-based fallback
+            sorted_df = self.content_fallback.recommend(activities, budget)
 
-    # Top N
-    top_recommendations = sorted_df.head(top_n).to_dict(orient="records")
-    save_recommendation_history(user_id, top_recommendations)
+        # Top N
+        return sorted_df.head(top_n).to_dict(orient="records")
 
-    return top_recommendations
+    def _rank_by_svd(self, user_id, filtered_df, top_n):
+        scorer = self.scorer
+        if len(filtered_df) < RETRIEVAL_MIN_CANDIDATES:
+            scored_df = filtered_df.assign(predicted_rating=scorer.score(user_id, filtered_df["item_id"]))
+            return scored_df.sort_values(by="predicted_rating", ascending=False)
 
-# === Content-Based Fallback ===
-def fallback_content_based(activities, budget, top_n):
-    tfidf = TfidfVectorizer(stop_words="english")
+        # Push the filters into retrieval: only items among the candidates are allowed
+        inner_items = scorer.item_indices(filtered_df["item_id"])
+        known = inner_items >= 0
+        allowed = np.zeros(len(scorer.qi), dtype=bool)
+        allowed[inner_items[known]] = True
+        top_items, _ = self.vector_index.search(scorer.query_vector(user_id), top_n, allowed)
 
-    if "activities" in destinations_df.columns:
-        text_column = destinations_df["activities"].fillna("")
-    elif "destination_name" in destinations_df.columns:
-        print("Fallback to 'destination_name' as 'activities' is missing.")
-        text_column = destinations_df["destination_name"].fillna("")
-    else:
-        raise ValueError("No suitable text column (activities or destination_name) found.")
+        # Items unknown to the model all share one estimate, so top_n of them are enough
+        keep = np.isin(inner_items, top_items) | (~known & (np.cumsum(~known) <= top_n))
+        scored_df = filtered_df[keep].assign(predicted_rating=scorer.score_indices(user_id, inner_items[keep]))
+        return scored_df.sort_values(by="predicted_rating", ascending=False)
 
-    tfidf_matrix = tfidf.fit_transform(text_column)
-    activity_query = " ".join(activities.split(",")) if activities else ""
-    query_vec = tfidf.transform([activity_query])
-    cosine_sim = cosine_similarity(query_vec, tfidf_matrix).flatten()
+    # --- Recommendation History ---
+    @staticmethod
+    def save_history(user_id, recommendations):
+        records = []
 
-    destinations_df["similarity"] = cosine_sim
-    fallback_df = destinations_df[destinations_df["price"] <= budget]
+        for rec in recommendations:
+            records.append({
+                "timestamp": datetime.utcnow().isoformat(),
+                "user_id": user_id,
+                "item_id": rec.get("item_id"),
+                "destination_name": rec.get("destination_name", rec.get("destination", "")),
+                "predicted_rating": rec.get("predicted_rating", None)
+            })
 
-    return fallback_df.sort_values(by="similarity", ascending=False)
+        history_sink.append(records)
 
-# === Recommendation History ===
-def save_recommendation_history(user_id, recommendations):
-    records = []
 
-    for rec in recommendations:
-        records.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "item_id": rec.get("item_id"),
-            "destination_name": rec.get("destination_name", ""),
-            "predicted_rating": rec.get("predicted_rating", None)
-        })
+# Process-wide engine behind both recommendation blueprints
+engine = HybridRecommender(registry)
 
-    history_df = pd.DataFrame(records)
 
-    if os.path.exists(RECOMMENDATION_HISTORY_FILE):
-        existing_df = pd.read_csv(RECOMMENDATION_HISTORY_FILE)
-        combined_df = pd.concat([existing_df, history_df], ignore_index=True)
-    else:
-        combined_df = history_df
+# === Public API ===
+def hybrid_recommend(user_id, budget, weather=None, activities=None, accommodation_type=None, destination=None, top_n=10):
+    return engine.recommend(user_id, budget, weather, activities, accommodation_type, destination, top_n)
 
-    combined_df.to_csv(RECOMMENDATION_HISTORY_FILE, index=False)
+def recommend_bundle(user_id, budget, weather=None, activities=None, accommodation_type=None, destination=None, k=3):
+    return engine.recommend_bundle(user_id, budget, weather, activities, accommodation_type, destination, k)
 
-# === Public API ===
-def recommend_items(user_id, budget, weather=None, activities=None, accommodation_type=None, top_n=10):
-    return hybrid_recommend(user_id, budget, weather, activities, accommodation_type, top_n)
+def recommend_items(user_id, budget, weather=None, activities=None, accommodation_type=None, destination=None, top_n=10):
+    return engine.recommend(user_id, budget, weather, activities, accommodation_type, destination, top_n)
 
 # === Test the Recommendation Function ===
+if __name__ == "__main__":
+    # Example test inputs
+    user_id = 1
+    budget = 500
 
-# Example test inputs
-user_id = 1  
-budget = 500  
+    # Optional filters (remove or modify these as needed)
+    weather = "hot"
+    activities = "beach"
+    accommodation_type = "hotel"
 
-# Optional filters (remove or modify these as needed)
-weather = "hot" 
-activities = "beach"  
-accommodation_type = "hotel" 
+    # Call the recommend_items function to generate recommendations
+    recommendations = recommend_items(user_id, budget, weather, activities, accommodation_type)
 
-# Call the recommend_items function to generate recommendations
-recommendations = recommend_items(user_id, budget, weather, activities, accommodation_type)
+    # Print the output (recommendations)
+    print("Recommendations:", recommendations)
 
-# Print the output (recommendations)
-print("Recommendations:", recommendations)
-
-# Optionally print the first recommendation in detail
-if recommendations:
-    print("First Recommendation:", recommendations[0])
-else:
-    print("No recommendations found.")
+    # Optionally print the first recommendation in detail
+    if recommendations:
+        print("First Recommendation:", recommendations[0])
+    else:
+        print("No recommendations found.")
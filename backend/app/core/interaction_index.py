@@ -0,0 +1,156 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# === Sparse User-Item Matrix ===
+def interaction_matrix(interactions_df, user_column="user_id", item_column="item_id", value_column="interaction"):
+    """Users x items CSR matrix of the mean ``value_column`` per (user, item).
+
+    The sparse equivalent of ``pivot_table(index=user_column,
+    columns=item_column, values=value_column).fillna(0)``: same sorted row
+    and column order, same rows and columns dropped, but memory grows with
+    the number of interactions rather than users x items. Returns
+    ``(matrix, user_ids, item_ids)`` with the ids as ``pd.Index``.
+    """
+    values = interactions_df[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(values) & interactions_df[user_column].notna().to_numpy() & interactions_df[item_column].notna().to_numpy()
+    user_codes, user_ids = pd.factorize(interactions_df[user_column][present], sort=True)
+    item_codes, item_ids = pd.factorize(interactions_df[item_column][present], sort=True)
+
+    # Duplicate (user, item) entries are summed by tocsr; divide by their count for the mean
+    shape = (len(user_ids), len(item_ids))
+    sums = sparse.coo_matrix((values[present], (user_codes, item_codes)), shape=shape).tocsr()
+    counts = sparse.coo_matrix((np.ones(len(user_codes)), (user_codes, item_codes)), shape=shape).tocsr()
+    sums.data /= counts.data
+    return sums, pd.Index(user_ids), pd.Index(item_ids)
+
+
+# === Per-User Interaction Index ===
+class InteractionIndex:
+    """User -> items adjacency over the interactions table, in CSR layout.
+
+    Users and items are mapped to integer codes once at load time; the items
+    of user ``u`` are ``indices[indptr[u]:indptr[u + 1]]`` (unique, sorted by
+    item code), so "what has this user already seen" costs O(items of user)
+    instead of a mask over the whole table. New interactions are appended to a
+    small per-user delta and folded into the CSR arrays by ``compact`` once the
+    delta grows past ``compact_threshold``; no rebuild is needed.
+    """
+
+    def __init__(self, user_ids, item_ids, indptr, indices, compact_threshold=10000):
+        self.user_codes = {user: code for code, user in enumerate(user_ids)}
+        self.item_codes = {item: code for code, item in enumerate(item_ids)}
+        # Item ids by code, with spare capacity so new items are not a full copy each
+        self._item_buffer = np.empty(max(len(item_ids), 16), dtype=object)
+        self._item_buffer[:len(item_ids)] = item_ids
+        self._n_items = len(item_ids)
+        self.compact_threshold = compact_threshold
+
+        # Readers take (indptr, indices, delta) as one snapshot; compaction swaps it whole
+        self._state = (np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64), {})
+        self._delta_size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, interactions_df, user_column="user_id", item_column="item_id", **kwargs):
+        user_codes, user_ids = pd.factorize(interactions_df[user_column])
+        item_codes, item_ids = pd.factorize(interactions_df[item_column])
+
+        # Drop rows with missing ids (factorize codes them as -1)
+        valid = (user_codes >= 0) & (item_codes >= 0)
+        user_codes, item_codes = user_codes[valid], item_codes[valid]
+
+        # Unique (user, item) pairs sorted by user, then item
+        n_items = len(item_ids)
+        pairs = np.unique(user_codes.astype(np.int64) * max(n_items, 1) + item_codes)
+        pair_users, pair_items = np.divmod(pairs, max(n_items, 1))
+
+        indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_users, minlength=len(user_ids)), out=indptr[1:])
+        return cls(list(user_ids), list(item_ids), indptr, pair_items, **kwargs)
+
+    def __len__(self):
+        return len(self.user_codes)
+
+    @property
+    def item_ids(self):
+        return self._item_buffer[:self._n_items]
+
+    def has_user(self, user_id):
+        return user_id in self.user_codes
+
+    def item_codes_of(self, user_id):
+        """Codes of the distinct items the user has interacted with."""
+        code = self.user_codes.get(user_id)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+
+        indptr, indices, delta = self._state
+        # Users added since the last compaction only have delta entries
+        codes = indices[indptr[code]:indptr[code + 1]] if code + 1 < len(indptr) else indices[:0]
+        appended = delta.get(code)
+        if appended:
+            codes = np.concatenate([codes, np.asarray(appended, dtype=np.int64)])
+        return codes
+
+    def items_of(self, user_id):
+        """Raw ids of the distinct items the user has interacted with."""
+        codes = self.item_codes_of(user_id)
+        # Read the buffer after the codes: append publishes an item before its code
+        return self._item_buffer[codes]
+
+    def append(self, user_id, item_id):
+        """Record a new interaction; returns False if the user had already seen the item."""
+        with self._lock:
+            user_code = self.user_codes.get(user_id)
+            if user_code is None:
+                user_code = self.user_codes[user_id] = len(self.user_codes)
+
+            item_code = self.item_codes.get(item_id)
+            if item_code is None:
+                item_code = self._add_item(item_id)
+            elif item_code in self.item_codes_of(user_id):
+                return False
+
+            # Replace rather than extend the list so concurrent readers never see it half-updated
+            delta = self._state[2]
+            delta[user_code] = delta.get(user_code, []) + [item_code]
+            self._delta_size += 1
+            if self._delta_size >= self.compact_threshold:
+                self._compact()
+        return True
+
+    def _add_item(self, item_id):
+        code = self._n_items
+        buffer = self._item_buffer
+        if code == len(buffer):
+            # Double the capacity; readers keep the old buffer until the swap
+            buffer = np.empty(2 * len(buffer), dtype=object)
+            buffer[:code] = self._item_buffer
+        buffer[code] = item_id
+        self._item_buffer = buffer
+        self._n_items = code + 1
+        self.item_codes[item_id] = code
+        return code
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        indptr, indices, delta = self._state
+        n_users = len(self.user_codes)
+
+        delta_users = np.array([u for u, items in delta.items() for _ in items], dtype=np.int64)
+        delta_items = np.array([i for items in delta.values() for i in items], dtype=np.int64)
+        users = np.concatenate([np.repeat(np.arange(len(indptr) - 1), np.diff(indptr)), delta_users])
+        items = np.concatenate([indices, delta_items])
+        order = np.lexsort((items, users))
+
+        new_indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(users, minlength=n_users), out=new_indptr[1:])
+        self._state = (new_indptr, items[order], {})
+        self._delta_size = 0
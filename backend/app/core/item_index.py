@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# === Columnar Filter Index ===
+class ItemIndex:
+    """Filter index over the destinations catalog, built once at load time.
+
+    Filters return packed bitmaps (one bit per catalog row) that callers
+    combine with ``&`` and materialise with ``take``. Results match the
+    DataFrame filters in ``hybrid_recommend``: case-insensitive equality on
+    categorical columns, substring match on activities, ``price <= budget``.
+    """
+
+    def __init__(self, items_df, categorical_columns=("weather", "accommodation_type", "destination"),
+                 activities_column="activities", price_column="price"):
+        self.items_df = items_df
+        self.size = len(items_df)
+
+        # Categorical codes per column, plus one bitmap per distinct value
+        self.codes = {}
+        self.value_bitmaps = {}
+        for col in categorical_columns:
+            if col not in items_df.columns:
+                continue
+            codes, values = pd.factorize(items_df[col].str.lower())
+            self.codes[col] = codes
+            self.value_bitmaps[col] = {
+                value: self._pack(codes == code) for code, value in enumerate(values)
+            }
+
+        # Inverted index: activity token -> item bitmap
+        self.activities_column = activities_column if activities_column in items_df.columns else None
+        self.token_bitmaps = {}
+        if self.activities_column:
+            lowered = pd.Series([str(x).lower() for x in items_df[activities_column]])
+            tokens = lowered.str.split(",").explode().str.strip()
+            rows = tokens.index.to_numpy()
+            for token, idx in tokens.groupby(tokens.to_numpy(), sort=False).indices.items():
+                mask = np.zeros(self.size, dtype=bool)
+                mask[rows[idx]] = True
+                self.token_bitmaps[token] = self._pack(mask)
+        self._activity_bitmap = lru_cache(maxsize=1024)(self._compute_activity_bitmap)
+
+        # Price-sorted row order so a budget cut is a binary search (NaN prices sort last)
+        prices = items_df[price_column].to_numpy(dtype=np.float64)
+        self.price_order = np.argsort(prices, kind="stable")
+        self.sorted_prices = prices[self.price_order]
+
+    def _pack(self, mask):
+        return np.packbits(mask)
+
+    def has_column(self, column):
+        return column in self.codes or column == self.activities_column
+
+    def all(self):
+        return self._pack(np.ones(self.size, dtype=bool))
+
+    def equals(self, column, value):
+        empty = self._pack(np.zeros(self.size, dtype=bool))
+        return self.value_bitmaps[column].get(str(value).lower(), empty)
+
+    def activities_any(self, activity_list):
+        bitmap = self._pack(np.zeros(self.size, dtype=bool))
+        for act in activity_list:
+            bitmap = bitmap | self._activity_bitmap(act)
+        return bitmap
+
+    def _compute_activity_bitmap(self, act):
+        # Substring semantics: OR the bitmaps of every token containing ``act``.
+        # Only the token vocabulary is scanned, and results are memoised per term.
+        bitmap = self._pack(np.zeros(self.size, dtype=bool))
+        for token, token_bitmap in self.token_bitmaps.items():
+            if act in token:
+                bitmap = bitmap | token_bitmap
+        return bitmap
+
+    def price_at_most(self, budget):
+        cut = np.searchsorted(self.sorted_prices, budget, side="right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.price_order[:cut]] = True
+        return self._pack(mask)
+
+    def positions(self, bitmap):
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+
+    def take(self, bitmap):
+        return self.items_df.iloc[self.positions(bitmap)]
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Empty, Queue
+
+from app.core.metrics import latency_summary
+
+
+# === Micro-Batching ===
+class MicroBatcher:
+    """Coalesces concurrent inference calls into batched forward passes.
+
+    ``submit`` enqueues one request and blocks until its result is ready. A
+    single worker thread takes the first queued request, keeps collecting
+    until ``max_batch_size`` requests are queued or ``max_wait_ms`` has passed
+    since that first request arrived, then calls ``batch_fn`` once with the
+    list of payloads and scatters the returned results back to the callers.
+    Batch sizes and queue/inference times are recorded for ``metrics``.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=32, max_wait_ms=5.0, name="micro-batcher", window=10000):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = {}
+        self._queue_times = deque(maxlen=window)
+        self._inference_times = deque(maxlen=window)
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, payload, timeout=None):
+        future = Future()
+        self._queue.put((time.perf_counter(), payload, future))
+        return future.result(timeout=timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        batch = [first]
+        deadline = first[0] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                results = self.batch_fn([payload for _, payload, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} requests")
+                for (_, _, future), result in zip(batch, results):
+                    future.set_result(result)
+                failed = False
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                failed = True
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._errors += failed
+                self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+                self._queue_times.extend(started - enqueued for enqueued, _, _ in batch)
+                self._inference_times.append(finished - started)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "requests": self._requests,
+                "batches": self._batches,
+                "errors": self._errors,
+                "queued": self._queue.qsize(),
+                "avg_batch_size": round(self._requests / self._batches, 3) if self._batches else 0.0,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "queue_time": latency_summary(list(self._queue_times)),
+                "inference_time": latency_summary(list(self._inference_times)),
+            }
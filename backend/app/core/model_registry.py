@@ -0,0 +1,296 @@
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# === Path Setup ===
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+DATA_DIR = os.path.join(APP_DIR, "data")
+MODELS_DIR = os.path.join(APP_DIR, "models")
+HOTELS_CSV = os.getenv("HOTELS_CSV", os.path.join(APP_DIR, "..", "..", "datasets", "Hotels.csv"))
+
+
+# === Model Registry ===
+class ModelRegistry:
+    """Process-wide registry of models and datasets, loaded lazily on first use.
+
+    Each artifact is registered with a zero-argument loader and loaded at most
+    once (under a per-artifact lock) the first time ``get`` asks for it, or
+    eagerly and in parallel via ``preload``. Load times are recorded per
+    artifact. ``depends_on`` lists artifacts derived from others so that a
+    ``reload`` also drops whatever was built on top of them; callbacks
+    registered with ``on_reload`` are told which artifacts were dropped.
+    ``watch`` names a file whose modification (e.g. by a retraining script)
+    causes the artifact to be reloaded on its next ``get``.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._dependents = {}
+        self._models = {}
+        self._load_times = {}
+        self._locks = {}
+        self._watched = {}
+        self._mtimes = {}
+        self._reload_callbacks = []
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, depends_on=(), watch=None):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        if watch:
+            self._watched[name] = watch
+        for parent in depends_on:
+            self._dependents.setdefault(parent, set()).add(name)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def get(self, name):
+        if name in self._watched and name in self._models:
+            if self._mtime(self._watched[name]) != self._mtimes.get(name):
+                self.reload(name)
+
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model artifact: {name}")
+
+        with self._locks[name]:
+            if name not in self._models:
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._load_times[name] = time.perf_counter() - start
+                if name in self._watched:
+                    self._mtimes[name] = self._mtime(self._watched[name])
+                print(f"Loaded '{name}' in {self._load_times[name] * 1000:.1f} ms")
+        return self._models[name]
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get_if_loaded(self, name):
+        return self._models.get(name)
+
+    def preload(self, names=None, max_workers=4):
+        """Load artifacts in parallel; failures are reported and skipped."""
+        names = list(names or self._loaders)
+        errors = {}
+
+        def _load(name):
+            try:
+                self.get(name)
+            except Exception as e:
+                errors[name] = str(e)
+                print(f"Failed to preload '{name}': {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_load, names))
+        return errors
+
+    def on_reload(self, callback):
+        self._reload_callbacks.append(callback)
+
+    def reload(self, name=None):
+        """Drop a loaded artifact (and everything derived from it), or all artifacts."""
+        with self._lock:
+            if name is None:
+                dropped = set(self._models)
+            else:
+                dropped, stack = set(), [name]
+                while stack:
+                    current = stack.pop()
+                    if current not in dropped:
+                        dropped.add(current)
+                        stack.extend(self._dependents.get(current, ()))
+            for dropped_name in dropped:
+                self._models.pop(dropped_name, None)
+                self._load_times.pop(dropped_name, None)
+
+        for callback in self._reload_callbacks:
+            callback(dropped)
+        return dropped
+
+    def status(self):
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_time_ms": round(self._load_times[name] * 1000, 2) if name in self._load_times else None,
+            }
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
+
+
+# === Artifacts ===
+def _model_path(name):
+    """Prefer the memory-mapped artifact directory over the legacy pickle."""
+    from app.core.artifacts import is_artifact
+    artifact_path = os.path.join(MODELS_DIR, name)
+    return artifact_path if is_artifact(artifact_path) else f"{artifact_path}.pkl"
+
+
+def _load_interactions():
+    # Training interactions (with the exported ratings) plus the ratings stored after the export
+    from app.data.training_interactions import load_training_interactions
+    from app.services.ratings_service import ratings_store
+    interactions_df, ratings_through = load_training_interactions()
+    ingested_df = ratings_store.to_frame(after_id=ratings_through)
+    if ingested_df.empty:
+        return interactions_df
+    return pd.concat([interactions_df, ingested_df], ignore_index=True)
+
+
+def _load_svd_model():
+    model_path = os.path.join(MODELS_DIR, "svd_model.pkl")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"SVD model not found at {model_path}")
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+def _load_svd_scorer():
+    from app.core.svd_scorer import SVDScorer
+    from app.services.ratings_service import ratings_store
+    model_path = _model_path("svd_model")
+    if os.path.isdir(model_path):
+        scorer = SVDScorer.load(model_path)
+    else:
+        # Legacy deployments only ship the pickled Surprise model
+        scorer = SVDScorer.from_surprise(registry.get("svd_model"))
+
+    # Ratings stored after the ones the model was trained on are folded in on every load
+    scorer.fold_in_frame(ratings_store.to_frame(after_id=scorer.ratings_through))
+    return scorer
+
+
+def _load_svd_vector_index():
+    from app.core.vector_index import build_vector_index
+    backend = os.getenv("VECTOR_INDEX_BACKEND", "exact")
+    kwargs = {"n_probe": int(os.getenv("VECTOR_INDEX_N_PROBE", 8))} if backend == "ivf" else {}
+    return build_vector_index(registry.get("svd_scorer").item_vectors(), backend, **kwargs)
+
+
+def _load_item_index():
+    from app.core.item_index import ItemIndex
+    return ItemIndex(registry.get("destinations"))
+
+
+def _load_interaction_index():
+    from app.core.interaction_index import InteractionIndex
+    return InteractionIndex.from_frame(registry.get("interactions"))
+
+
+def _load_content_fallback():
+    from app.core.content_fallback import ContentFallback
+    return ContentFallback(registry.get("destinations"), text_columns=("activities", "destination_name", "destination"))
+
+
+def _load_hotel_index():
+    from app.core.hotel_index import HotelIndex
+    return HotelIndex.from_csv(HOTELS_CSV)
+
+
+def _load_cf_model():
+    # TensorFlow is only imported when the CF model is first needed
+    from app.recommenders.cf_model import load_cf_model
+    return load_cf_model("models/cf_model.h5")
+
+
+def _load_cf_recommender():
+    from app.core.artifacts import is_artifact
+    from app.recommenders.collaborative_filtering import CFRecommender
+
+    embeddings_path = os.path.join(MODELS_DIR, "cf_embeddings")
+    if is_artifact(embeddings_path):
+        # Exported embedding tables: NumPy only, TensorFlow is never imported
+        from app.recommenders.cf_embeddings import CFEmbeddingScorer
+        scorer = CFEmbeddingScorer.load(embeddings_path)
+        predict_fn, user_ids, item_ids = scorer.predict, scorer.user_ids, scorer.item_ids
+        score_users_fn = scorer.score_users
+    else:
+        from app.recommenders.cf_model import embedding_input_dims, make_predict_fn
+        model = registry.get("cf_model")
+
+        # Codes must match training, so the vocabularies come from the training CSV only
+        user_ids, item_ids = CFRecommender.vocabularies(pd.read_csv(os.path.join(DATA_DIR, "cleaned_interactions.csv")))
+        n_users, n_items = embedding_input_dims(model)[:2]
+        predict_fn, user_ids, item_ids = make_predict_fn(model), user_ids[:n_users], item_ids[:n_items]
+        score_users_fn = None
+
+    return CFRecommender(
+        predict_fn,
+        user_ids,
+        item_ids,
+        seen_items=lambda user_id: registry.get("interaction_index").items_of(user_id),
+        max_batch_size=int(os.getenv("CF_BATCH_MAX_SIZE", 32)),
+        max_wait_ms=float(os.getenv("CF_BATCH_MAX_WAIT_MS", 5)),
+        score_users_fn=score_users_fn,
+    )
+
+
+def _load_clustering_model():
+    from app.recommenders.clustering_model import load_clustering_model
+    return load_clustering_model("models/clustering_model.pkl")
+
+
+def _load_cluster_tables():
+    from app.data.training_interactions import load_training_interactions
+    from app.recommenders import clustering_model
+    from app.services.ratings_service import ratings_store
+    tables_path = os.path.join(MODELS_DIR, "cluster_tables.pkl")
+    if os.path.exists(tables_path):
+        tables = clustering_model.load_cluster_tables(tables_path)
+    else:
+        # No offline tables yet: build them once from the training interactions and persist
+        interactions_df, ratings_through = load_training_interactions()
+        tables = clustering_model.build_cluster_tables(
+            registry.get("clustering_model"),
+            clustering_model.load_preprocessor(os.path.join(MODELS_DIR, "user_preprocessor.pkl")),
+            registry.get("user_features"),
+            interactions_df,
+            ratings_through=ratings_through,
+        )
+        clustering_model.save_cluster_tables(tables, tables_path)
+
+    # The persisted tables stop at ``ratings_through``; ratings stored since are counted on every load
+    tables.record_frame(ratings_store.to_frame(after_id=tables.ratings_through))
+    return tables
+
+
+def _load_content_based_model():
+    from app.recommenders.content_model import load_cb_model, prepare_cb_model
+    return prepare_cb_model(load_cb_model(_model_path("content_based_model")))
+
+
+registry.register("destinations", lambda: pd.read_csv(os.path.join(DATA_DIR, "cleaned_feature_hybrid_dataset.csv")))
+registry.register("interactions", _load_interactions)
+registry.register("user_features", lambda: pd.read_csv(os.path.join(DATA_DIR, "user_features.csv")))
+registry.register("svd_model", _load_svd_model)
+registry.register("svd_scorer", _load_svd_scorer, depends_on=("svd_model",))
+registry.register("svd_vector_index", _load_svd_vector_index, depends_on=("svd_scorer",))
+registry.register("item_index", _load_item_index, depends_on=("destinations",))
+registry.register("interaction_index", _load_interaction_index, depends_on=("interactions",))
+registry.register("content_fallback", _load_content_fallback, depends_on=("destinations",))
+registry.register("hotel_index", _load_hotel_index, watch=HOTELS_CSV)
+registry.register("cf_model", _load_cf_model)
+registry.register("cf_recommender", _load_cf_recommender, depends_on=("cf_model",))
+registry.register("clustering_model", _load_clustering_model)
+registry.register("content_based_model", _load_content_based_model)
+registry.register(
+    "cluster_tables", _load_cluster_tables,
+    depends_on=("clustering_model",), watch=os.path.join(MODELS_DIR, "cluster_tables.pkl"),
+)
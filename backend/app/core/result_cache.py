@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.model_registry import registry
+
+
+# === TTL + LRU Cache ===
+class TTLCache:
+    """Thread-safe LRU cache with optional per-entry TTL and tag invalidation.
+
+    Entries can carry a tag (e.g. the user id) so that every entry for that tag
+    can be dropped at once with ``invalidate_tag``.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _remove(self, key):
+        _, _, tag = self._data.pop(key)
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[0] is not None and entry[0] < time.monotonic()):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tag=None, ttl=None):
+        # A per-entry ttl can only shorten the cache-wide one
+        if ttl is None:
+            ttl = self.ttl or None
+        elif self.ttl:
+            ttl = min(ttl, self.ttl)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires_at, value, tag)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# === Hybrid Recommendation Caches ===
+# Tier 1: user-independent filtered candidate bitmaps, keyed by normalised filters
+candidate_cache = TTLCache(maxsize=int(os.getenv("CANDIDATE_CACHE_SIZE", 1024)))
+
+# Tier 2: per-user ranked results, tagged by user id for invalidation
+result_cache = TTLCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", 300)),
+)
+
+
+def filter_key(weather=None, activities=None, accommodation_type=None, destination=None):
+    """Normalise filters the same way the hybrid filters compare them."""
+    return (
+        weather.lower() if weather else None,
+        tuple(a.strip().lower() for a in activities.split(",")) if activities else None,
+        accommodation_type.lower() if accommodation_type else None,
+        destination.lower() if destination else None,
+    )
+
+
+def invalidate_user(user_id):
+    return result_cache.invalidate_tag(user_id)
+
+
+def clear_all(*_):
+    candidate_cache.clear()
+    result_cache.clear()
+
+
+def cache_stats():
+    return {"candidates": candidate_cache.stats(), "results": result_cache.stats()}
+
+
+# Cached candidates and rankings are stale once any model artifact is reloaded
+registry.on_reload(clear_all)
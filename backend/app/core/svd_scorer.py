@@ -0,0 +1,225 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.core.artifacts import load_artifact, save_artifact
+
+
+# === Vectorized SVD Scoring ===
+class SVDScorer:
+    """Batch scorer over the factors of a trained Surprise SVD model.
+
+    Produces the same estimates as ``svd_model.predict(uid, iid).est``
+    (including clipping and the unknown user/item fallback), but scores
+    all candidates for a user with a single matrix-vector product.
+
+    Ratings that arrive after training can be folded in online with
+    ``fold_in``: the user's ``pu``/``bu`` are re-solved against the fixed item
+    factors, and the result overrides the offline factors for that user.
+    ``ratings_through`` is the id of the last stored rating the model was
+    trained on; later ones are folded in at load time.
+    """
+
+    def __init__(self, pu, qi, bu, bi, global_mean, rating_scale,
+                 user_raw_ids, item_raw_ids, biased=True, reg_pu=0.02, reg_bu=0.02, user_ratings=None,
+                 ratings_through=0):
+        self.pu = np.ascontiguousarray(pu, dtype=np.float64)
+        self.qi = np.ascontiguousarray(qi, dtype=np.float64)
+        self.bu = np.ascontiguousarray(bu, dtype=np.float64)
+        self.bi = np.ascontiguousarray(bi, dtype=np.float64)
+        self.global_mean = float(global_mean)
+        self.rating_scale = (float(rating_scale[0]), float(rating_scale[1]))
+        self.biased = biased
+        self.reg_pu = float(reg_pu)
+        self.reg_bu = float(reg_bu)
+        self.ratings_through = int(ratings_through)
+
+        # Raw id -> inner index maps (position in the factor arrays)
+        self.user_raw_ids = np.asarray(user_raw_ids)
+        self.user_index = {raw: inner for inner, raw in enumerate(self.user_raw_ids.tolist())}
+        self.item_lookup = pd.Index(np.asarray(item_raw_ids))
+
+        # Training ratings per user in CSR layout (indptr, items, ratings), used by fold_in
+        self.user_ratings = user_ratings
+
+        # Online state: ratings seen since load and the folded-in (pu, bu) per user
+        self._online_ratings = {}
+        self._online_factors = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_surprise(cls, model, ratings_through=0):
+        trainset = model.trainset
+        user_raw_ids = [trainset.to_raw_uid(u) for u in range(trainset.n_users)]
+        item_raw_ids = [trainset.to_raw_iid(i) for i in range(trainset.n_items)]
+
+        rows = [trainset.ur[u] for u in range(trainset.n_users)]
+        indptr = np.zeros(trainset.n_users + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        user_ratings = {
+            "indptr": indptr,
+            "items": np.array([i for row in rows for i, _ in row], dtype=np.int64),
+            "ratings": np.array([r for row in rows for _, r in row], dtype=np.float64),
+        }
+
+        return cls(
+            pu=model.pu,
+            qi=model.qi,
+            bu=model.bu if model.biased else np.zeros(trainset.n_users),
+            bi=model.bi if model.biased else np.zeros(trainset.n_items),
+            global_mean=trainset.global_mean,
+            rating_scale=trainset.rating_scale,
+            user_raw_ids=user_raw_ids,
+            item_raw_ids=item_raw_ids,
+            biased=model.biased,
+            reg_pu=model.reg_pu,
+            reg_bu=model.reg_bu,
+            user_ratings=user_ratings,
+            ratings_through=ratings_through,
+        )
+
+    def to_artifact(self):
+        return {
+            "pu": self.pu,
+            "qi": self.qi,
+            "bu": self.bu,
+            "bi": self.bi,
+            "user_raw_ids": self.user_raw_ids,
+            "item_raw_ids": self.item_lookup.to_numpy(),
+            "global_mean": self.global_mean,
+            "rating_scale": list(self.rating_scale),
+            "biased": bool(self.biased),
+            "reg_pu": self.reg_pu,
+            "reg_bu": self.reg_bu,
+            "user_ratings": self.user_ratings,
+            "ratings_through": self.ratings_through,
+        }
+
+    @classmethod
+    def from_artifact(cls, contents):
+        return cls(**contents)
+
+    def save(self, path):
+        return save_artifact(path, self.to_artifact(), kind="svd")
+
+    @classmethod
+    def load(cls, path):
+        """Load factors saved with ``save``; the factor arrays stay memory-mapped."""
+        return cls.from_artifact(load_artifact(path))
+
+    def item_indices(self, item_ids):
+        """Map raw item ids to inner indices (-1 for items unknown to the model)."""
+        return self.item_lookup.get_indexer(pd.Index(list(item_ids)))
+
+    def score(self, user_id, item_ids):
+        return self.score_indices(user_id, self.item_indices(item_ids))
+
+    def user_factors(self, user_id):
+        """(pu, bu) for the user, folded-in factors first; None if the user is unknown."""
+        online = self._online_factors.get(user_id)
+        if online is not None:
+            return online
+        u = self.user_index.get(user_id)
+        if u is None:
+            return None
+        return self.pu[u], self.bu[u]
+
+    # --- Retrieval ---
+    def item_vectors(self):
+        """Augmented item vectors ``[q_i, b_i, 1]`` for a maximum inner product index."""
+        n_items = len(self.qi)
+        return np.hstack([self.qi, self.bi[:, None], np.ones((n_items, 1))])
+
+    def query_vector(self, user_id):
+        """``[p_u, 1, mu + b_u]``: its inner product with ``item_vectors`` is the unclipped estimate."""
+        factors = self.user_factors(user_id)
+        if factors is None:
+            return np.concatenate([np.zeros(self.qi.shape[1]), [1.0, self.global_mean]])
+        return np.concatenate([factors[0], [1.0, self.global_mean + factors[1]]])
+
+    def score_indices(self, user_id, inner_items):
+        inner_items = np.asarray(inner_items, dtype=np.int64)
+        known_items = inner_items >= 0
+        safe_items = np.where(known_items, inner_items, 0)
+        factors = self.user_factors(user_id)
+
+        if self.biased:
+            est = np.full(len(inner_items), self.global_mean)
+            if factors is not None:
+                est += factors[1]
+            est += np.where(known_items, self.bi[safe_items], 0.0)
+            if factors is not None:
+                est += np.where(known_items, self.qi[safe_items] @ factors[0], 0.0)
+        else:
+            # Surprise falls back to the global mean when a prediction is impossible
+            est = np.full(len(inner_items), self.global_mean)
+            if factors is not None:
+                est = np.where(known_items, self.qi[safe_items] @ factors[0], est)
+
+        lower_bound, higher_bound = self.rating_scale
+        return np.clip(est, lower_bound, higher_bound)
+
+    # --- Online updates ---
+    def fold_in(self, user_id, ratings):
+        """Re-solve one user's factors after new ``(item_id, rating)`` pairs arrive.
+
+        Item factors and biases stay fixed, so the SVD objective restricted to
+        this user is a ridge regression with a closed-form solution:
+
+            min_x  sum_i (r_ui - mu - b_i - z_i . x)^2 + reg * |x|^2
+
+        with ``x = [p_u, b_u]`` and ``z_i = [q_i, 1]``. The sum runs over the
+        user's training ratings plus every rating folded in since load (the
+        latest rating per item wins); items unknown to the model are ignored.
+        Artifacts saved without training ratings regularise towards the
+        offline factors instead of zero. Returns False if there was nothing to
+        fold in.
+        """
+        ratings = list(ratings)
+        if not ratings:
+            return False
+        item_ids, values = zip(*ratings)
+        inner_items = self.item_indices(item_ids)
+
+        with self._lock:
+            observed = dict(self._online_ratings.get(user_id, {}))
+            for inner, value in zip(inner_items, values):
+                if inner >= 0:
+                    observed[int(inner)] = float(value)
+            if not observed:
+                return False
+            self._online_ratings[user_id] = observed
+
+            u = self.user_index.get(user_id)
+            combined = observed
+            if u is not None and self.user_ratings is not None:
+                start, end = self.user_ratings["indptr"][u], self.user_ratings["indptr"][u + 1]
+                combined = dict(zip(self.user_ratings["items"][start:end].tolist(),
+                                    self.user_ratings["ratings"][start:end].tolist()))
+                combined.update(observed)
+
+            items = np.fromiter(combined.keys(), dtype=np.int64, count=len(combined))
+            targets = np.fromiter(combined.values(), dtype=np.float64, count=len(combined))
+            n_factors = self.qi.shape[1]
+            # Without training ratings the offline factors are the best prior for a known user
+            centred_on_offline = u is not None and self.user_ratings is None
+
+            if self.biased:
+                features = np.hstack([self.qi[items], np.ones((len(items), 1))])
+                targets = targets - self.global_mean - self.bi[items]
+                reg = np.append(np.full(n_factors, self.reg_pu), self.reg_bu)
+                prior = np.append(self.pu[u], self.bu[u]) if centred_on_offline else np.zeros(n_factors + 1)
+            else:
+                features = self.qi[items]
+                reg = np.full(n_factors, self.reg_pu)
+                prior = np.array(self.pu[u]) if centred_on_offline else np.zeros(n_factors)
+
+            solution = np.linalg.solve(features.T @ features + np.diag(reg), features.T @ targets + reg * prior)
+            self._online_factors[user_id] = (solution[:n_factors], solution[n_factors] if self.biased else 0.0)
+        return True
+
+    def fold_in_frame(self, ratings_df, user_column="user_id", item_column="item_id", rating_column="interaction"):
+        """Replay a ratings table (e.g. ratings ingested since training) through ``fold_in``."""
+        for user_id, group in ratings_df.groupby(user_column, sort=False):
+            self.fold_in(user_id, zip(group[item_column], group[rating_column]))
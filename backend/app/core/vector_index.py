@@ -0,0 +1,151 @@
+import numpy as np
+
+
+def _top_k(scores, k):
+    """Positions of the k highest finite scores, best first."""
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    finite = np.flatnonzero(np.isfinite(scores))
+    if len(finite) > k:
+        finite = finite[np.argpartition(-scores[finite], k - 1)[:k]]
+    return finite[np.argsort(-scores[finite], kind="stable")]
+
+
+# === Exact Backend ===
+class ExactVectorIndex:
+    """Brute-force maximum inner product search, one block of items at a time.
+
+    Scores ``block_size`` items per matrix-vector product and keeps only the
+    running top-k, so memory stays O(block_size + k) however many items there
+    are. ``allowed`` is an optional boolean mask over items; disallowed items
+    are never returned.
+    """
+
+    def __init__(self, vectors, block_size=65536):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.block_size = block_size
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search(self, query, k, allowed=None):
+        query = np.asarray(query, dtype=np.float32)
+        best_indices = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, len(self.vectors), self.block_size):
+            stop = start + self.block_size
+            scores = self.vectors[start:stop] @ query
+            if allowed is not None:
+                scores[~allowed[start:stop]] = -np.inf
+            top = _top_k(scores, k)
+            best_indices = np.concatenate([best_indices, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_indices) > k:
+                keep = _top_k(best_scores, k)
+                best_indices, best_scores = best_indices[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind="stable")
+        return best_indices[order], best_scores[order]
+
+
+# === IVF Backend ===
+class IVFVectorIndex:
+    """Inverted-file index for approximate maximum inner product search.
+
+    Items are clustered with k-means into ``n_lists`` lists (stored
+    contiguously, CSR-style). A query scores the centroids, then scans the
+    ``n_probe`` most promising lists exactly. With an ``allowed`` mask,
+    further lists are probed until k allowed items have been seen, so strict
+    filters trade speed for completeness instead of returning short results.
+    """
+
+    def __init__(self, vectors, n_lists=None, n_probe=8, n_iter=10, sample_per_list=64, seed=0):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n_items = len(vectors)
+        self.n_lists = max(1, min(n_items, n_lists or int(np.sqrt(n_items))))
+        self.n_probe = n_probe
+
+        self.centroids = self._train_centroids(vectors, n_iter, sample_per_list, seed)
+        assignments = self._assign(vectors, self.centroids)
+
+        # Items grouped by list: list j holds items order[offsets[j]:offsets[j + 1]]
+        self.order = np.argsort(assignments, kind="stable")
+        self.offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=self.n_lists), out=self.offsets[1:])
+        self.list_vectors = vectors[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    @staticmethod
+    def _assign(vectors, centroids, block_size=65536):
+        # argmin ||x - c||^2 == argmax (x . c - ||c||^2 / 2)
+        half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block_size):
+            block = vectors[start:start + block_size]
+            assignments[start:start + block_size] = np.argmax(block @ centroids.T - half_norms, axis=1)
+        return assignments
+
+    def _train_centroids(self, vectors, n_iter, sample_per_list, seed):
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), self.n_lists * sample_per_list)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, self.n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignments = self._assign(sample, centroids)
+            counts = np.bincount(assignments, minlength=self.n_lists)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            non_empty = counts > 0
+            centroids[non_empty] = sums[non_empty] / counts[non_empty, None]
+            # Re-seed empty lists from random sample points
+            empty = np.flatnonzero(~non_empty)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        return centroids
+
+    def search(self, query, k, allowed=None, n_probe=None):
+        query = np.asarray(query, dtype=np.float32)
+        n_probe = n_probe or self.n_probe
+        probe_order = np.argsort(-(self.centroids @ query), kind="stable")
+
+        candidate_indices, candidate_scores = [], []
+        found = 0
+        for probed, list_id in enumerate(probe_order):
+            if probed >= n_probe and found >= k:
+                break
+            start, stop = self.offsets[list_id], self.offsets[list_id + 1]
+            if start == stop:
+                continue
+            items = self.order[start:stop]
+            scores = self.list_vectors[start:stop] @ query
+            if allowed is not None:
+                keep = allowed[items]
+                items, scores = items[keep], scores[keep]
+            candidate_indices.append(items)
+            candidate_scores.append(scores)
+            found += len(items)
+
+        if not candidate_indices:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        indices = np.concatenate(candidate_indices)
+        scores = np.concatenate(candidate_scores)
+        top = _top_k(scores, k)
+        return indices[top], scores[top]
+
+
+VECTOR_INDEX_BACKENDS = {
+    "exact": ExactVectorIndex,
+    "ivf": IVFVectorIndex,
+}
+
+
+def build_vector_index(vectors, backend="exact", **kwargs):
+    try:
+        index_class = VECTOR_INDEX_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown vector index backend '{backend}'. Choose from: {', '.join(VECTOR_INDEX_BACKENDS)}")
+    return index_class(vectors, **kwargs)
@@ -0,0 +1,123 @@
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+CHUNK_SIZE = 250_000
+
+# === Vectorised Cleaning ===
+# Column-at-a-time versions of the per-row parsers the training scripts used
+# to ``Series.apply``. Each one matches the row-wise rule it replaces (noted
+# in its docstring); string work runs once per distinct value, since price
+# and cost columns repeat heavily.
+
+
+def _per_unique(series, parse):
+    """Run ``parse`` on the distinct values of ``series`` and broadcast back."""
+    if is_numeric_dtype(series) or len(series) == 0:
+        return parse(series)
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    parsed = parse(pd.Series(uniques, dtype=object))
+    return pd.Series(parsed.to_numpy()[codes], index=series.index, name=series.name)
+
+
+def _as_text(series):
+    # Same text str() gives each value, NaN included ("nan")
+    return pd.Series(series.to_numpy(dtype=object).astype(str), index=series.index, dtype=object)
+
+
+def extract_largest_price(series):
+    """Largest number in each price or price range ("$100 - 150" -> 150.0).
+
+    Everything but digits, dots, whitespace and hyphens is dropped. If any
+    part of a range is not a number, the whole value is NaN.
+    """
+    def parse(values):
+        cleaned = _as_text(values).str.replace(r"[^\d.\s-]", "", regex=True).str.strip()
+        parts = cleaned.str.split("-", expand=True)
+        numbers = parts.apply(lambda part: pd.to_numeric(part.str.strip(), errors="coerce"))
+        n_parts = cleaned.str.count("-") + 1
+        complete = numbers.notna().sum(axis=1) == n_parts
+        return numbers.max(axis=1).where(complete).astype(float)
+
+    return _per_unique(series, parse)
+
+
+def clean_interaction(series):
+    """Interaction values as floats: missing -> 0.0, strings keep digits and dots only.
+
+    A string with no digits left is 0.0; one that is still not a number
+    (e.g. "1.2.3") raises ``ValueError``.
+    """
+    def parse(values):
+        if is_numeric_dtype(values):
+            return values.astype(float).fillna(0.0)
+        is_text = values.map(type, na_action="ignore") == str
+        digits = values[is_text].astype(str).str.replace(r"[^\d.]", "", regex=True)
+        parsed = pd.Series(0.0, index=values.index)
+        parsed[is_text] = pd.to_numeric(digits.mask(digits == "", "0")).astype(float)
+        other = ~is_text & values.notna()
+        parsed[other] = values[other].astype(float)
+        return parsed
+
+    return _per_unique(series, parse)
+
+
+def clean_price(series, na_value=float("nan")):
+    """Prices with "$", "USD" and thousands separators removed; unparseable -> 0.0.
+
+    Missing values become ``na_value``.
+    """
+    def parse(values):
+        if is_numeric_dtype(values):
+            return values.astype(float).fillna(na_value)
+        text = _as_text(values).str.replace("$", "", regex=False).str.replace("USD", "", regex=False)
+        text = text.str.replace(",", "", regex=False).str.strip()
+        parsed = pd.to_numeric(text, errors="coerce").astype(float)
+        # float() parses "nan" too; only text that is not a number falls back to 0.0
+        parsed[parsed.isna() & ~text.str.lower().isin(["nan", "+nan", "-nan"])] = 0.0
+        parsed[values.isna()] = na_value
+        return parsed
+
+    return _per_unique(series, parse)
+
+
+def extract_rating(series):
+    """Mean of the numbers in each interaction string ("4 5 USD" -> 4.5).
+
+    Only whitespace-separated tokens made of digits and at most one dot
+    count; a string without any is 0. Missing values are 0.
+    """
+    def parse(values):
+        if is_numeric_dtype(values):
+            return values.astype(float).fillna(0.0)
+        is_text = values.map(type, na_action="ignore") == str
+        text = values[is_text].astype(str).str.replace("$", "", regex=False)
+        text = text.str.replace("USD", "", regex=False).str.replace(",", "", regex=False)
+
+        tokens = text.str.extractall(r"(?<!\S)(\d+\.?\d*|\.\d+)(?!\S)")[0].astype(float)
+        parsed = pd.Series(0.0, index=values.index)
+        means = tokens.groupby(level=0).mean()
+        parsed[means.index] = means
+        other = ~is_text & values.notna()
+        parsed[other] = values[other].astype(float)
+        return parsed
+
+    return _per_unique(series, parse)
+
+
+def make_item_id(destination, accommodation_type):
+    """"{destination}_{accommodation_type}" item ids, built column-wise."""
+    return _as_text(destination) + "_" + _as_text(accommodation_type)
+
+
+# === Chunked Reading ===
+def read_csv_cleaned(path, clean_chunk, chunksize=CHUNK_SIZE, **read_csv_kwargs):
+    """Read ``path`` ``chunksize`` rows at a time, cleaning each chunk as it arrives.
+
+    Only one raw chunk is held in memory at a time, so the peak is the
+    cleaned result plus one chunk of unparsed strings. ``clean_chunk`` must
+    work row by row (no cross-row steps such as global de-duplication).
+    """
+    chunks = [clean_chunk(chunk) for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)]
+    if not chunks:
+        return pd.read_csv(path, nrows=0, **read_csv_kwargs)
+    return pd.concat(chunks, ignore_index=True)
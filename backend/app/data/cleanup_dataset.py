@@ -1,37 +1,76 @@
+import os
+import sys
+
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler, LabelEncoder
 
-# Load dataset
-df = pd.read_csv("cleaned_feature_hybrid_dataset.csv")
-
-# Step 1: Normalize 'interaction' to a 1-5 rating scale using Min-Max
-scaler = MinMaxScaler(feature_range=(1, 5))
-df['rating'] = scaler.fit_transform(df[['interaction']])
-df['rating'] = df['rating'].round(2)  # Round to 2 decimal places
-
-# Step 2: Drop exact duplicates (optional but useful)
-df = df.drop_duplicates()
-
-# Step 3: Encode categorical features
-label_encoders = {}
-for col in ['user_id', 'item_id', 'destination', 'accommodation_type', 'gender', 'nationality']:
-    le = LabelEncoder()
-    df[col] = le.fit_transform(df[col])
-    label_encoders[col] = le
-
-# Step 4: Final dataset structure
-clean_df = df[[
-    'user_id',
-    'item_id',
-    'rating',  # This is your target for recommender system
-    'destination',
-    'accommodation_type',
-    'price',
-    'age',
-    'gender',
-    'nationality'
-]]
-
-# Save cleaned data
-clean_df.to_csv("cleaned_ratings_data.csv", index=False)
-print("Cleaned data saved to 'cleaned_ratings_data.csv'")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.core.artifacts import load_frame, save_artifact
+from app.data.training_interactions import RATINGS_EXPORT_PATH, load_exported_ratings
+
+DATA_DIR = os.path.abspath(os.path.dirname(__file__))
+# Columnar handoff from clean_feature_hybrid.py (load_frame also accepts the CSV)
+INPUT_PATH = os.path.join(DATA_DIR, "pipeline", "cleaned_feature_hybrid_dataset")
+OUTPUT_PATH = os.path.join(DATA_DIR, "pipeline", "cleaned_ratings_data")
+
+
+def _rated_rows(df, ratings_df):
+    # API ratings carry only (user, item, rating): take the other columns from the user's and item's rows.
+    # Ids are matched as strings (the store may hold 7 where the CSV has "7") but keep the frame's values.
+    items = df.drop_duplicates('item_id')[['item_id', 'destination', 'accommodation_type', 'price']]
+    users = df.drop_duplicates('user_id')[['user_id', 'age', 'gender', 'nationality']]
+    rated = pd.DataFrame({
+        'item_key': ratings_df['item_id'].astype(str),
+        'user_key': ratings_df['user_id'].astype(str),
+        'rating': ratings_df['interaction'].astype(float).clip(lower=1.0, upper=5.0),
+    })
+    rated = rated.merge(items.assign(item_key=items['item_id'].astype(str)), on='item_key')
+    rated = rated.merge(users.assign(user_key=users['user_id'].astype(str)), on='user_key')
+    return rated.drop(columns=['item_key', 'user_key'])
+
+
+def cleanup_dataset(input_path=INPUT_PATH, output_path=OUTPUT_PATH, ratings_path=RATINGS_EXPORT_PATH):
+    # Load dataset
+    df = load_frame(input_path)
+
+    # Step 1: Normalize 'interaction' to a 1-5 rating scale using Min-Max
+    scaler = MinMaxScaler(feature_range=(1, 5))
+    df['rating'] = scaler.fit_transform(df[['interaction']])
+    df['rating'] = df['rating'].round(2)  # Round to 2 decimal places
+
+    # Ratings stored through the API are already on the 1-5 scale
+    ratings_df, ratings_through = load_exported_ratings(ratings_path)
+    if not ratings_df.empty:
+        df = pd.concat([df, _rated_rows(df, ratings_df)], ignore_index=True)
+
+    # Step 2: Drop exact duplicates (optional but useful)
+    df = df.drop_duplicates()
+
+    # Step 3: Encode categorical features
+    label_encoders = {}
+    for col in ['user_id', 'item_id', 'destination', 'accommodation_type', 'gender', 'nationality']:
+        le = LabelEncoder()
+        df[col] = le.fit_transform(df[col])
+        label_encoders[col] = le
+
+    # Step 4: Final dataset structure
+    clean_df = df[[
+        'user_id',
+        'item_id',
+        'rating',  # This is your target for recommender system
+        'destination',
+        'accommodation_type',
+        'price',
+        'age',
+        'gender',
+        'nationality'
+    ]]
+
+    # Save cleaned data, with the last stored rating it includes for the models trained on it
+    save_artifact(output_path, {"frame": clean_df, "ratings_through": ratings_through}, kind="frame")
+    print(f"Cleaned data saved to '{output_path}'")
+    return clean_df
+
+
+if __name__ == "__main__":
+    cleanup_dataset()
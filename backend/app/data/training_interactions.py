@@ -0,0 +1,60 @@
+import json
+import os
+
+import pandas as pd
+
+from app.services.ratings_store import read_ratings
+
+DATA_DIR = os.path.abspath(os.path.dirname(__file__))
+INTERACTIONS_PATH = os.path.join(DATA_DIR, "cleaned_interactions.csv")
+RATINGS_DB_PATH = os.getenv("RATINGS_DB_PATH", os.path.join(DATA_DIR, "ratings.db"))
+# Ratings exported from the store for training, plus the id of the last one exported
+RATINGS_EXPORT_PATH = os.path.join(DATA_DIR, "pipeline", "ingested_ratings.csv")
+RATINGS_COLUMNS = ["user_id", "item_id", "interaction"]
+
+
+# === Ratings Export ===
+def _watermark_path(path):
+    return f"{path}.json"
+
+
+def export_ratings(ratings_path=RATINGS_DB_PATH, output_path=RATINGS_EXPORT_PATH):
+    """Write every rating in the store to ``output_path`` for the training scripts.
+
+    The id of the last rating written is recorded next to it; artifacts
+    trained on the export keep that id as ``ratings_through`` so that serving
+    only replays the ratings stored after it. Returns that id.
+    """
+    ratings_df = read_ratings(ratings_path) if os.path.exists(ratings_path) else pd.DataFrame(columns=RATINGS_COLUMNS)
+    ratings_through = int(ratings_df.index.max()) if len(ratings_df) else 0
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    ratings_df[RATINGS_COLUMNS].to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output_path)
+    with open(tmp_path, "w") as f:
+        json.dump({"ratings_through": ratings_through}, f)
+    os.replace(tmp_path, _watermark_path(output_path))
+    return ratings_through
+
+
+def load_exported_ratings(path=RATINGS_EXPORT_PATH):
+    """(ratings, ratings_through) from ``export_ratings``; empty with 0 if nothing was exported."""
+    if not os.path.exists(path) or not os.path.exists(_watermark_path(path)):
+        return pd.DataFrame(columns=RATINGS_COLUMNS), 0
+    with open(_watermark_path(path)) as f:
+        ratings_through = json.load(f)["ratings_through"]
+    return pd.read_csv(path), ratings_through
+
+
+def load_training_interactions(interactions_path=INTERACTIONS_PATH, ratings_path=RATINGS_EXPORT_PATH):
+    """Cleaned interactions plus the exported ratings, and the last rating id included."""
+    interactions_df = pd.read_csv(interactions_path)
+    ratings_df, ratings_through = load_exported_ratings(ratings_path)
+    if ratings_df.empty:
+        return interactions_df, ratings_through
+    return pd.concat([interactions_df, ratings_df], ignore_index=True), ratings_through
+
+
+if __name__ == "__main__":
+    print(f"Exported ratings through id {export_ratings()} to {RATINGS_EXPORT_PATH}")
@@ -15,10 +15,17 @@ from app.routes.auth_routes import auth_bp
 from app.api.recommendations import recommendations_bp  # Import the updated recommendations blueprint
 from app.routes.recommendation_routes import recommendation_bp  # Ensure this is correctly imported
 from app.routes.history_routes import history_bp  
+from app.api.hotels import hotels_bp
+
+# Bearer-token middleware (verified sessions are cached)
+from app.utils.auth import init_auth
 
 # DB connection
 from app.utils.db import connect_to_db
 
+# Shared model registry (artifacts load lazily unless PRELOAD_MODELS is set)
+from app.core.model_registry import registry
+
 # Initialize the Flask app
 app = Flask(__name__)
 
@@ -30,16 +37,24 @@ CORS(
     supports_credentials=True
 )
 
+# Verify the bearer token once per request and attach the user to flask.g
+init_auth(app)
+
 # Register Blueprints
 app.register_blueprint(auth_bp, url_prefix="/api/auth")
 app.register_blueprint(recommendations_bp, url_prefix="/api/recommendations")  # Ensure recommendation routes are registered
 app.register_blueprint(recommendation_bp, url_prefix="/api")  # This includes your `/recommendations` API route
 app.register_blueprint(history_bp, url_prefix="/api")
+app.register_blueprint(hotels_bp, url_prefix="/api/hotels")
 
 @app.route("/", methods=["GET"])
 def home():
     return {"message": "Travel Recommender Backend is running 🚀"}
 
+# Opt-in warm start: load every model artifact in parallel before serving
+if os.getenv("PRELOAD_MODELS", "").lower() in ("1", "true", "yes"):
+    registry.preload()
+
 if __name__ == "__main__":
     try:
         connect_to_db()  
@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.core.artifacts import load_artifact, save_artifact
+
+# NumPy-only inference for the CF model: no TensorFlow import at serve time.
+
+class CFEmbeddingScorer:
+    """Scores (user, item) pairs from the CF model's exported embedding tables.
+
+    The Keras model in ``train/train_cf_model.py`` is two Embedding lookups
+    followed by a Dot, so its output is exactly the float32 inner product of
+    the two embedding rows. ``user_ids``/``item_ids`` are the vocabularies in
+    code order (the category codes used in training).
+    """
+
+    def __init__(self, user_embeddings, item_embeddings, user_ids, item_ids):
+        self.user_embeddings = np.asarray(user_embeddings, dtype=np.float32)
+        self.item_embeddings = np.asarray(item_embeddings, dtype=np.float32)
+        self.user_ids = list(np.asarray(user_ids).tolist())
+        self.item_ids = list(np.asarray(item_ids).tolist())
+
+    def predict(self, user_codes, item_codes):
+        """Same contract as ``cf_model.make_predict_fn``: one score per (user code, item code) pair."""
+        users = self.user_embeddings[np.asarray(user_codes, dtype=np.int64)]
+        items = self.item_embeddings[np.asarray(item_codes, dtype=np.int64)]
+        return np.einsum("ij,ij->i", users, items)
+
+    def score_users(self, user_codes):
+        """Scores of each user against every item, one row per user code."""
+        return self.user_embeddings[np.asarray(user_codes, dtype=np.int64)] @ self.item_embeddings.T
+
+    def to_artifact(self):
+        return {
+            "user_embeddings": self.user_embeddings,
+            "item_embeddings": self.item_embeddings,
+            "user_ids": np.asarray(self.user_ids),
+            "item_ids": np.asarray(self.item_ids),
+        }
+
+    def save(self, path):
+        return save_artifact(path, self.to_artifact(), kind="cf_embeddings")
+
+    @classmethod
+    def load(cls, path):
+        return cls(**load_artifact(path))
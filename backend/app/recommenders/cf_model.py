@@ -69,6 +69,21 @@ def train_cf(trips_df, test_size=0.2, random_state=42):
         logger.error(f"Error training collaborative filtering model: {str(e)}")
         raise
 
+# Batched Scoring
+def make_predict_fn(model):
+    """Score arrays of (user code, item code) pairs in one call, without Keras predict() overhead."""
+    def predict(user_codes, item_codes):
+        inputs = [
+            tf.convert_to_tensor(user_codes.reshape(-1, 1), dtype=tf.float32),
+            tf.convert_to_tensor(item_codes.reshape(-1, 1), dtype=tf.float32),
+        ]
+        return model(inputs, training=False).numpy().ravel()
+    return predict
+
+def embedding_input_dims(model):
+    """Vocabulary sizes of the model's embedding layers, in layer order (users, then items)."""
+    return [layer.input_dim for layer in model.layers if isinstance(layer, tf.keras.layers.Embedding)]
+
 # Load Saved Model
 def load_cf_model(model_path='models/cf_model.h5'):
     try:
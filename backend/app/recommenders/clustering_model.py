@@ -1,6 +1,7 @@
 # === File: app/recommenders/clustering_model.py ===
 
 import os
+import threading
 import joblib
 import pandas as pd
 from sklearn.cluster import KMeans
@@ -10,6 +11,7 @@ from sklearn.compose import ColumnTransformer
 # === Paths ===
 MODEL_PATH = 'app/models/clustering_model.pkl'
 PREPROCESSOR_PATH = 'app/models/user_preprocessor.pkl'
+CLUSTER_TABLES_PATH = 'app/models/cluster_tables.pkl'
 
 
 def train_clustering(user_features_df, n_clusters=5, model_path=MODEL_PATH, preprocessor_path=PREPROCESSOR_PATH):
@@ -55,32 +57,135 @@ def load_preprocessor(path=PREPROCESSOR_PATH):
     return joblib.load(path)
 
 
-def get_user_cluster_recommendations(user_id, num_recommendations, model, user_feats_df, interactions_df):
-    if user_id not in user_feats_df['user_id'].values:
-        raise ValueError(f"User ID {user_id} not found in user feature data.")
-
-    # Preprocess using saved pipeline
-    preprocessor = load_preprocessor()
+# === Precomputed Cluster Tables ===
+class ClusterTables:
+    """user -> cluster assignments plus a ranked top-K item list per cluster.
+
+    Built offline (see ``build_cluster_tables`` and ``user_clustering.py``) so
+    that serving a user is two dictionary lookups. ``record_interaction``
+    keeps the counts and rankings current as new interactions arrive;
+    ``record_frame`` counts a batch of them at once (e.g. on load).
+    ``ratings_through`` is the id of the last stored rating the persisted
+    counts include.
+    """
+
+    def __init__(self, user_clusters, cluster_members, cluster_counts, top_k=100, ratings_through=0):
+        self.user_clusters = user_clusters
+        self.cluster_members = cluster_members
+        self.cluster_counts = cluster_counts
+        self.top_k = top_k
+        self.ratings_through = ratings_through
+        self.ranked = {
+            cluster: sorted(counts.items(), key=lambda kv: -kv[1])[:top_k]
+            for cluster, counts in cluster_counts.items()
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_assignments(cls, user_clusters_df, interactions_df, top_k=100, ratings_through=0):
+        """Build tables from a (user_id, cluster) frame and the interaction log."""
+        # A user's own cluster is taken from their first feature row
+        user_clusters = user_clusters_df.drop_duplicates("user_id").set_index("user_id")["cluster"].to_dict()
+        cluster_members = {
+            cluster: set(users)
+            for cluster, users in user_clusters_df.groupby("cluster")["user_id"]
+        }
+
+        cluster_counts = {}
+        for cluster, members in cluster_members.items():
+            counts = (
+                interactions_df[interactions_df["user_id"].isin(members)]
+                .groupby("item_id").size()
+                .sort_values(ascending=False, kind="stable")
+            )
+            cluster_counts[cluster] = counts.to_dict()
+
+        return cls(user_clusters, cluster_members, cluster_counts, top_k=top_k, ratings_through=ratings_through)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        # Tables pickled before ratings_through existed hold training interactions only
+        state.setdefault("ratings_through", 0)
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def recommend(self, user_id, num_recommendations):
+        cluster = self.user_clusters.get(user_id)
+        if cluster is None:
+            raise ValueError(f"User ID {user_id} not found in user feature data.")
+
+        if num_recommendations <= self.top_k:
+            return [item_id for item_id, _ in self.ranked.get(cluster, [])[:num_recommendations]]
+
+        with self._lock:
+            counts = list(self.cluster_counts.get(cluster, {}).items())
+        counts.sort(key=lambda kv: -kv[1])
+        return [item_id for item_id, _ in counts[:num_recommendations]]
+
+    def record_interaction(self, user_id, item_id):
+        """Count a new interaction in every cluster the user belongs to."""
+        with self._lock:
+            for cluster, members in self.cluster_members.items():
+                if user_id not in members:
+                    continue
+                counts = self.cluster_counts.setdefault(cluster, {})
+                counts[item_id] = counts.get(item_id, 0) + 1
+                self._rerank(cluster, item_id, counts[item_id])
+
+    def record_frame(self, interactions_df):
+        """Count every (user_id, item_id) row of ``interactions_df`` and re-rank once."""
+        if interactions_df.empty:
+            return
+        with self._lock:
+            for cluster, members in self.cluster_members.items():
+                added = interactions_df[interactions_df["user_id"].isin(members)].groupby("item_id").size()
+                if added.empty:
+                    continue
+                counts = self.cluster_counts.setdefault(cluster, {})
+                for item_id, count in added.items():
+                    counts[item_id] = counts.get(item_id, 0) + int(count)
+                self.ranked[cluster] = sorted(counts.items(), key=lambda kv: -kv[1])[:self.top_k]
+
+    def _rerank(self, cluster, item_id, count):
+        # A count only ever grows, so the item can only move up the ranking: O(K)
+        ranked = list(self.ranked.get(cluster, []))
+        position = next((i for i, (item, _) in enumerate(ranked) if item == item_id), None)
+        if position is None:
+            if len(ranked) >= self.top_k and count <= ranked[-1][1]:
+                return
+            ranked.append((item_id, count))
+            position = len(ranked) - 1
+        else:
+            ranked[position] = (item_id, count)
+        while position > 0 and ranked[position - 1][1] < count:
+            ranked[position - 1], ranked[position] = ranked[position], ranked[position - 1]
+            position -= 1
+        self.ranked[cluster] = ranked[:self.top_k]
+
+
+def build_cluster_tables(model, preprocessor, user_feats_df, interactions_df, top_k=100, ratings_through=0):
     user_features = user_feats_df[['user_id', 'age', 'gender', 'nationality']].drop_duplicates()
-    X_processed = preprocessor.transform(user_features)
+    user_features = user_features.assign(cluster=model.predict(preprocessor.transform(user_features)))
+    return ClusterTables.from_assignments(
+        user_features[['user_id', 'cluster']], interactions_df, top_k=top_k, ratings_through=ratings_through,
+    )
 
-    # Predict cluster for all users
-    user_features['cluster'] = model.predict(X_processed)
 
-    # Get user cluster
-    user_cluster = user_features[user_features['user_id'] == user_id]['cluster'].values[0]
-    cluster_user_ids = user_features[user_features['cluster'] == user_cluster]['user_id'].tolist()
+def save_cluster_tables(tables, path=CLUSTER_TABLES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(tables, path)
 
-    # Filter interactions by users in same cluster
-    cluster_interactions = interactions_df[interactions_df['user_id'].isin(cluster_user_ids)]
 
-    # Recommend most interacted items in the cluster
-    top_items = (
-        cluster_interactions.groupby('item_id')
-        .size()
-        .reset_index(name='count')
-        .sort_values('count', ascending=False)
-        .head(num_recommendations)
-    )
+def load_cluster_tables(path=CLUSTER_TABLES_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Cluster tables not found at {path}")
+    return joblib.load(path)
+
 
-    return top_items['item_id'].tolist()
+def get_user_cluster_recommendations(user_id, num_recommendations, tables):
+    # Two lookups: user -> cluster, cluster -> ranked items
+    return tables.recommend(user_id, num_recommendations)
@@ -1,5 +1,75 @@
+import numpy as np
 import pandas as pd
 
-def get_cf_recommendations(df, user_id):
-    user_interacted = df[df['user_id'] == user_id]['item_id'].tolist()
+from app.core.micro_batcher import MicroBatcher
+from app.recommenders.content_model import top_k_indices
+
+def get_cf_recommendations(df, user_id, interaction_index=None):
+    # Seen items come from the per-user index (O(items of user)) instead of a mask over df;
+    # by default the registry's shared index, never one rebuilt from df per call
+    if interaction_index is None:
+        from app.core.model_registry import registry
+        interaction_index = registry.get("interaction_index")
+    user_interacted = interaction_index.items_of(user_id)
     return df[~df['item_id'].isin(user_interacted)].head(5)
+
+# === Batched CF Model Serving ===
+class CFRecommender:
+    """Top-N recommendations from the trained CF model, served through a micro-batcher.
+
+    The model (``train/train_cf_model.py``) scores (user code, item code)
+    pairs, where codes are the category codes of ``user_id``/``item_id`` in
+    the training interactions. Each request scores one user against every
+    item; concurrent requests are stacked into a single forward pass.
+    ``seen_items`` returns the items a user has already interacted with,
+    which are excluded from the results. When ``score_users_fn`` is given
+    it scores a batch of user codes against every item in one matrix
+    product; ``predict_fn`` over (user, item) pairs is the fallback.
+    """
+
+    def __init__(self, predict_fn, user_ids, item_ids, seen_items=None, max_batch_size=32, max_wait_ms=5.0,
+                 score_users_fn=None):
+        self.predict_fn = predict_fn
+        self.score_users_fn = score_users_fn
+        self.user_codes = {user: code for code, user in enumerate(user_ids)}
+        self.item_codes = {item: code for code, item in enumerate(item_ids)}
+        self.item_ids = np.asarray(item_ids, dtype=object)
+        self.seen_items = seen_items
+        self.batcher = MicroBatcher(self._score_users, max_batch_size, max_wait_ms, name="cf-batcher")
+
+    @staticmethod
+    def vocabularies(training_df):
+        """User and item ids in code order, as ``astype("category").cat.codes`` assigned them in training."""
+        return (
+            list(training_df['user_id'].astype("category").cat.categories),
+            list(training_df['item_id'].astype("category").cat.categories),
+        )
+
+    def _score_users(self, user_codes):
+        if self.score_users_fn is not None:
+            return list(np.asarray(self.score_users_fn(user_codes), dtype=np.float64))
+
+        # Pair path for the Keras model: B * n_items (user, item) inputs
+        n_items = len(self.item_ids)
+        users = np.repeat(np.asarray(user_codes, dtype=np.int64), n_items)
+        items = np.tile(np.arange(n_items, dtype=np.int64), len(user_codes))
+        scores = np.asarray(self.predict_fn(users, items), dtype=np.float64)
+        return list(scores.reshape(len(user_codes), n_items))
+
+    def recommend(self, user_id, n=10):
+        code = self.user_codes.get(user_id)
+        if code is None:
+            raise ValueError(f"User {user_id} is unknown to the CF model.")
+
+        scores = self.batcher.submit(code).copy()
+        if self.seen_items is not None:
+            seen = [self.item_codes[item] for item in self.seen_items(user_id) if item in self.item_codes]
+            scores[seen] = -np.inf
+
+        return [
+            {"item_id": self.item_ids[i], "score": float(scores[i])}
+            for i in top_k_indices(scores, n) if np.isfinite(scores[i])
+        ]
+
+    def metrics(self):
+        return self.batcher.metrics()
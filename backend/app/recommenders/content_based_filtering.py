@@ -1,17 +1,24 @@
+import numpy as np
 from sklearn.metrics.pairwise import linear_kernel
 
+from app.recommenders.content_model import top_k_indices
+
 def get_cb_recommendations(hotel_id, num_recommendations, model_data):
     """Recommend hotels based on content similarity to a given hotel ID."""
-    tfidf_matrix = model_data['tfidf_matrix']
     hotels_df = model_data['hotels_df']
+    neighbours = model_data['neighbours']
 
-    if hotel_id not in hotels_df['id'].values:
+    idx = model_data['item_positions'].get(hotel_id)
+    if idx is None:
         raise ValueError(f"Hotel ID {hotel_id} not found in dataset.")
 
-    cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
-    idx = hotels_df.index[hotels_df['id'] == hotel_id][0]
-    sim_scores = list(enumerate(cosine_sim[idx]))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+    # Stored neighbours include the item itself, hence the +1
+    if num_recommendations + 1 <= neighbours['indices'].shape[1]:
+        ranked = neighbours['indices'][idx, :num_recommendations + 1]
+    else:
+        # Ad-hoc K beyond the stored table: score one row and select with argpartition
+        scores = linear_kernel(model_data['tfidf_matrix'][idx], model_data['tfidf_matrix']).ravel()
+        ranked = top_k_indices(scores, num_recommendations + 1)
 
-    top_indices = [i[0] for i in sim_scores[1:num_recommendations + 1]]
+    top_indices = np.asarray(ranked[1:num_recommendations + 1])
     return hotels_df.iloc[top_indices].to_dict(orient='records')
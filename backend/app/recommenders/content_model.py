@@ -1,9 +1,12 @@
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import linear_kernel
 import joblib
 from pathlib import Path
 
+from app.core.artifacts import is_artifact, load_artifact, save_artifact
+
 def train_content(items_df):
     items_df.columns = items_df.columns.str.strip().str.replace('\r', '', regex=False).str.replace('\n', '', regex=False)
     print("Loaded columns:", items_df.columns.tolist())
@@ -16,13 +19,59 @@ def train_content(items_df):
 
     return tfidf, tfidf_matrix
 
-def compute_similarity_matrix(tfidf_matrix):
-    return linear_kernel(tfidf_matrix, tfidf_matrix)
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, ordered by score desc then index asc (O(n) selection)."""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+def build_neighbour_table(tfidf_matrix, k=50, block_size=1024):
+    """Top-k neighbours of every item (itself included) as index and score arrays.
+
+    Similarities are computed one block of rows at a time, so peak memory is
+    block_size x n instead of the full n x n matrix.
+    """
+    n_items = tfidf_matrix.shape[0]
+    k = min(k, n_items)
+    indices = np.empty((n_items, k), dtype=np.int32)
+    scores = np.empty((n_items, k), dtype=np.float32)
+
+    for start in range(0, n_items, block_size):
+        block = linear_kernel(tfidf_matrix[start:start + block_size], tfidf_matrix)
+        for offset, row in enumerate(block):
+            top = top_k_indices(row, k)
+            indices[start + offset] = top
+            scores[start + offset] = row[top]
+
+    return {"indices": indices, "scores": scores}
+
+def prepare_cb_model(model_data, k=50):
+    """Attach serving structures to a loaded content model: neighbour table and id -> row lookup."""
+    if "neighbours" not in model_data:
+        model_data["neighbours"] = build_neighbour_table(model_data["tfidf_matrix"], k=k)
+    # The dense n x n matrix is not needed once the neighbour table exists
+    model_data.pop("similarity_matrix", None)
+
+    hotels_df = model_data["hotels_df"]
+    id_column = "id" if "id" in hotels_df.columns else "item_id"
+    ids = hotels_df[id_column]
+    first_rows = ~ids.duplicated()
+    model_data["item_positions"] = dict(zip(ids[first_rows], np.flatnonzero(first_rows.to_numpy())))
+    return model_data
 
 def save_cb_model(model_data, model_path):
-    joblib.dump(model_data, model_path)
+    # Serving structures are rebuilt on load, only the trained parts are stored
+    contents = {key: value for key, value in model_data.items() if key not in ("item_positions", "similarity_matrix")}
+    save_artifact(model_path, contents, kind="content_based")
 
 def load_cb_model(model_path):
+    # Memory-mapped artifact directory; legacy joblib pickles are still readable
+    if is_artifact(model_path):
+        return load_artifact(model_path)
     return joblib.load(model_path)
 
 if __name__ == "__main__":
@@ -31,16 +80,16 @@ if __name__ == "__main__":
     print("Fixed columns:", items_df.columns.tolist())
 
     tfidf, tfidf_matrix = train_content(items_df)
-    similarity_matrix = compute_similarity_matrix(tfidf_matrix)
+    neighbours = build_neighbour_table(tfidf_matrix)
 
     model_dict = {
         "tfidf_model": tfidf,
         "tfidf_matrix": tfidf_matrix,
-        "similarity_matrix": similarity_matrix,
+        "neighbours": neighbours,
         "hotels_df": items_df
     }
 
-    model_save_path = Path(__file__).resolve().parent.parent / 'models' / 'content_based_model.pkl'
+    model_save_path = Path(__file__).resolve().parent.parent / 'models' / 'content_based_model'
     model_save_path.parent.mkdir(parents=True, exist_ok=True)
     save_cb_model(model_dict, model_save_path)
 
@@ -1,7 +1,7 @@
 #routes/auth_routes.py
 
 from flask import Blueprint
-from app.controllers.authController import register, login, reset_password
+from app.controllers.authController import register, login, reset_password, hasher_metrics, session_cache_stats
 
 # Create a Blueprint for the auth routes
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -10,3 +10,5 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 auth_bp.route('/register', methods=['POST'])(register)
 auth_bp.route('/login', methods=['POST'])(login)
 auth_bp.route('/reset-password', methods=['POST'])(reset_password)
+auth_bp.route('/hasher/metrics', methods=['GET'])(hasher_metrics)
+auth_bp.route('/sessions/cache', methods=['GET'])(session_cache_stats)
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from services.history_service import save_recommendation_history, get_recommendation_history
+from app.services.history_service import save_recommendation_history, get_recommendation_history
+from app.utils.auth import request_user_id
 
 history_bp = Blueprint('history', __name__)
 
@@ -7,7 +8,7 @@ history_bp = Blueprint('history', __name__)
 def save_history():
     try:
         data = request.get_json()
-        user_id = data.get("user_id")
+        user_id = request_user_id(data.get("user_id"))
         recommendations = data.get("recommendations")
 
         if not user_id or not recommendations:
@@ -22,7 +23,7 @@ def save_history():
 @history_bp.route('/history', methods=['GET'])
 def get_history():
     try:
-        user_id = request.args.get("user_id", type=int)
+        user_id = request_user_id(request.args.get("user_id", type=int))
 
         if user_id is None:
             return jsonify({"error": "user_id is required"}), 400
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.core.hybrid_recommender import recommend_items
-from services.ratings_service import store_rating
-from services.history_service import save_recommendation_history, get_recommendation_history
+from app.services.ratings_service import store_rating
+from app.services.history_service import get_recommendation_history
+from app.utils.auth import request_user_id
 
 recommendation_bp = Blueprint('recommendation', __name__)
 
@@ -10,6 +11,8 @@ def get_hybrid_recommendations():
     try:
         data = request.get_json()
         print("🔍 Incoming data:", data)
+        # A verified token takes precedence over the user_id in the body
+        data['user_id'] = request_user_id(data.get('user_id'))
 
         required_fields = ['user_id', 'budget']
         missing_fields = [field for field in required_fields if data.get(field) is None]
@@ -39,9 +42,6 @@ def get_hybrid_recommendations():
             top_n=top_n
         )
 
-        if isinstance(recommendations, list) and recommendations:
-            save_recommendation_history(user_id, recommendations)
-
         return jsonify({'recommendations': recommendations}), 200
 
     except Exception as e:
@@ -54,6 +54,7 @@ def get_hybrid_recommendations():
 def rate_item():
     try:
         data = request.get_json()
+        data['user_id'] = request_user_id(data.get('user_id'))
         required_fields = ['user_id', 'item_id', 'rating']
         missing = [f for f in required_fields if data.get(f) is None]
         if missing:
@@ -69,7 +70,7 @@ def rate_item():
 @recommendation_bp.route('/history', methods=['GET'])
 def get_history():
     try:
-        user_id = request.args.get('user_id', type=int)
+        user_id = request_user_id(request.args.get('user_id', type=int))
         if not user_id:
             return jsonify({'error': 'user_id is required'}), 400
 
@@ -0,0 +1,65 @@
+import os
+import sys
+import pickle
+
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.core.artifacts import save_artifact
+from app.core.svd_scorer import SVDScorer
+from app.recommenders.content_model import build_neighbour_table, save_cb_model
+
+# Converts the legacy pickled models into memory-mapped artifact directories
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "models"))
+
+
+def export_svd_model():
+    with open(os.path.join(MODELS_DIR, "svd_model.pkl"), "rb") as f:
+        model = pickle.load(f)
+    return SVDScorer.from_surprise(model).save(os.path.join(MODELS_DIR, "svd_model"))
+
+
+def export_content_based_model():
+    model_data = joblib.load(os.path.join(MODELS_DIR, "content_based_model.pkl"))
+    if "neighbours" not in model_data:
+        model_data["neighbours"] = build_neighbour_table(model_data["tfidf_matrix"])
+    output_path = os.path.join(MODELS_DIR, "content_based_model")
+    save_cb_model(model_data, output_path)
+    return output_path
+
+
+def export_content_model():
+    with open(os.path.join(MODELS_DIR, "content_model.pkl"), "rb") as f:
+        first, items_df = pickle.load(f)
+    # Older pickles hold the dense similarity matrix instead of the neighbour table
+    neighbours = first if isinstance(first, dict) else build_neighbour_table(first)
+    return save_artifact(os.path.join(MODELS_DIR, "content_model"),
+                         {"neighbours": neighbours, "items_df": items_df}, kind="content")
+
+
+def export_hybrid_model():
+    with open(os.path.join(MODELS_DIR, "hybrid_model.pkl"), "rb") as f:
+        model_data = pickle.load(f)
+    if hasattr(model_data.get("cf_model"), "trainset"):
+        model_data["cf_model"] = SVDScorer.from_surprise(model_data["cf_model"]).to_artifact()
+    return save_artifact(os.path.join(MODELS_DIR, "hybrid_model"), model_data, kind="hybrid")
+
+
+EXPORTS = {
+    "svd_model": export_svd_model,
+    "content_based_model": export_content_based_model,
+    "content_model": export_content_model,
+    "hybrid_model": export_hybrid_model,
+}
+
+
+def main(names=None):
+    for name in names or EXPORTS:
+        try:
+            print(f"Exported {name} -> {EXPORTS[name]()}")
+        except FileNotFoundError as e:
+            print(f"Skipping {name}: {e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
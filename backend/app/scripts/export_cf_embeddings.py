@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.recommenders.cf_embeddings import CFEmbeddingScorer
+from app.recommenders.cf_model import load_cf_model
+from app.recommenders.collaborative_filtering import CFRecommender
+
+# Dumps the CF model's embedding tables and vocabularies so serving never imports TensorFlow
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INTERACTIONS_PATH = os.path.join(APP_DIR, "data", "cleaned_interactions.csv")
+OUTPUT_PATH = os.path.join(APP_DIR, "models", "cf_embeddings")
+
+
+def export_cf_embeddings(model_path="models/cf_model.h5", output_path=OUTPUT_PATH):
+    import tensorflow as tf
+
+    model = load_cf_model(model_path)
+    user_embeddings, item_embeddings = [
+        layer.get_weights()[0] for layer in model.layers if isinstance(layer, tf.keras.layers.Embedding)
+    ][:2]
+
+    # Codes were assigned by astype("category") over the training interactions
+    user_ids, item_ids = CFRecommender.vocabularies(pd.read_csv(INTERACTIONS_PATH))
+    scorer = CFEmbeddingScorer(
+        user_embeddings, item_embeddings,
+        user_ids[:len(user_embeddings)], item_ids[:len(item_embeddings)],
+    )
+    return scorer.save(output_path)
+
+
+if __name__ == "__main__":
+    print(f"CF embeddings exported to {export_cf_embeddings()}")
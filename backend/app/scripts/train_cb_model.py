@@ -1,8 +1,14 @@
 import os
+import sys
 import pandas as pd
-import pickle
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.core.artifacts import save_artifact
+from app.recommenders.content_model import build_neighbour_table
+
+# Its own artifact: app/models/content_model is train_content.py's {neighbours, items_df} schema
+MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "models", "content_tfidf_model"))
 
 def train_content(items_df):
     # Create a synthetic description from destination, accommodation_type, and price
@@ -21,18 +27,13 @@ def train_content(items_df):
 
     return tfidf, tfidf_matrix
 
-def compute_similarity_matrix(tfidf_matrix):
-    # Compute cosine similarity matrix
-    return linear_kernel(tfidf_matrix, tfidf_matrix)
-
-def save_cb_model(tfidf, similarity_matrix, items_df, filename="app/models/content_model.pkl"):
-    # Save TF-IDF model, similarity matrix, and item index mapping
-    with open(filename, "wb") as f:
-        pickle.dump({
-            "tfidf": tfidf,
-            "similarity_matrix": similarity_matrix,
-            "item_ids": list(items_df["item_id"])
-        }, f)
+def save_cb_model(tfidf, neighbours, items_df, filename=MODEL_PATH):
+    # Save TF-IDF model, top-K neighbour table, and item index mapping
+    save_artifact(filename, {
+        "tfidf": tfidf,
+        "neighbours": neighbours,
+        "item_ids": items_df["item_id"].to_numpy()
+    }, kind="content_tfidf")
     print(f"Model saved to {filename}")
 
 def main():
@@ -50,10 +51,10 @@ def main():
 
     print("Training content-based model...")
     tfidf, tfidf_matrix = train_content(hotels_df)
-    similarity_matrix = compute_similarity_matrix(tfidf_matrix)
+    neighbours = build_neighbour_table(tfidf_matrix)
 
     print("Saving model...")
-    save_cb_model(tfidf, similarity_matrix, hotels_df)
+    save_cb_model(tfidf, neighbours, hotels_df)
     print("Done.")
 
 if __name__ == "__main__":
@@ -2,80 +2,74 @@ import os
 import json
 from datetime import datetime
 
-# Get absolute base directory
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "..", "data")
-HISTORY_FILE = os.path.join(DATA_DIR, "user_recommendation_history.json")
-
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
-
-# Ensure history file exists and is initialized
-if not os.path.exists(HISTORY_FILE):
-    with open(HISTORY_FILE, "w") as f:
-        json.dump([], f)
+import pandas as pd
 
-def save_recommendation_history(user_id, recommendations):
-    # Load existing history
-    with open(HISTORY_FILE, "r") as f:
-        try:
-            history = json.load(f)
-        except json.JSONDecodeError:
-            history = []
-
-    # Add new entries
-    new_entries = []
-    for rec in recommendations:
-        new_entries.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "item_id": rec.get("item_id"),
-            "destination_name": rec.get("destination_name", ""),
-            "predicted_rating": rec.get("predicted_rating", None)
-        })
-
-    history.extend(new_entries)
-
-    # Save updated history
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=4)
-
-def get_recommendation_history(user_id=None):
-    with open(HISTORY_FILE, "r") as f:
-        try:
-            history = json.load(f)
-        except json.JSONDecodeError:
-            return []
-
-    if user_id:
-        return [entry for entry in history if entry["user_id"] == user_id]
-    return history
-import os
-import json
-from datetime import datetime
+from app.services.history_sink import HistorySink
 
 # Get absolute base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "..", "data")
-HISTORY_FILE = os.path.join(DATA_DIR, "user_recommendation_history.json")
+HISTORY_DIR = os.getenv("HISTORY_DIR", os.path.join(DATA_DIR, "recommendation_history"))
+
+# Legacy whole-file history stores, imported once into the append-only log
+LEGACY_HISTORY_FILES = [
+    os.path.join(DATA_DIR, "user_recommendation_history.json"),
+    os.path.join(DATA_DIR, "recommendation_history.csv"),
+]
+# Created by the one process that imports the legacy files
+LEGACY_IMPORT_MARKER = os.path.join(HISTORY_DIR, ".legacy-imported")
+
+# Shared by every history writer in the process
+history_sink = HistorySink(
+    HISTORY_DIR,
+    segment_max_bytes=int(os.getenv("HISTORY_SEGMENT_MAX_BYTES", 64 * 1024 * 1024)),
+    batch_size=int(os.getenv("HISTORY_BATCH_SIZE", 256)),
+    flush_interval=float(os.getenv("HISTORY_FLUSH_INTERVAL", 1.0)),
+)
+
+
+def _import_legacy_history():
+    # Every worker runs this at import time; only the one that creates the marker imports
+    try:
+        fd = os.open(LEGACY_IMPORT_MARKER, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return
+    os.close(fd)
+
+    if not history_sink.is_empty():
+        return
+
+    try:
+        records = _read_legacy_records()
+    except Exception:
+        # Nothing was queued yet, so a later start can retry the import
+        os.remove(LEGACY_IMPORT_MARKER)
+        raise
+    history_sink.append(records)
+    history_sink.flush()
+
+
+def _read_legacy_records():
+    records = []
+    for path in LEGACY_HISTORY_FILES:
+        if not os.path.exists(path):
+            continue
+        try:
+            if path.endswith(".json"):
+                with open(path, "r") as f:
+                    records.extend(json.load(f))
+            else:
+                records.extend(pd.read_csv(path).to_dict(orient="records"))
+        except (json.JSONDecodeError, pd.errors.EmptyDataError):
+            continue
+    return records
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
 
-# Ensure history file exists and is initialized
-if not os.path.exists(HISTORY_FILE):
-    with open(HISTORY_FILE, "w") as f:
-        json.dump([], f)
+_import_legacy_history()
 
-def save_recommendation_history(user_id, recommendations):
-    # Load existing history
-    with open(HISTORY_FILE, "r") as f:
-        try:
-            history = json.load(f)
-        except json.JSONDecodeError:
-            history = []
 
-    # Add new entries
+def save_recommendation_history(user_id, recommendations):
+    # Queue new entries; the background writer appends them to the log
     new_entries = []
     for rec in recommendations:
         new_entries.append({
@@ -86,19 +80,10 @@ def save_recommendation_history(user_id, recommendations):
             "predicted_rating": rec.get("predicted_rating", None)
         })
 
-    history.extend(new_entries)
+    history_sink.append(new_entries)
 
-    # Save updated history
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=4)
 
 def get_recommendation_history(user_id=None):
-    with open(HISTORY_FILE, "r") as f:
-        try:
-            history = json.load(f)
-        except json.JSONDecodeError:
-            return []
-
     if user_id:
-        return [entry for entry in history if entry["user_id"] == user_id]
-    return history
+        return history_sink.get(user_id)
+    return history_sink.get()
@@ -0,0 +1,290 @@
+import os
+import json
+import glob
+import time
+import atexit
+import secrets
+import threading
+
+import numpy as np
+
+SEGMENT_PREFIX = "history-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def _to_json(value):
+    # numpy scalars (item ids, predicted ratings) are not JSON serializable by default
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# === Append-Only History Sink ===
+class HistorySink:
+    """Batched, append-only recommendation history log.
+
+    Records are queued by ``append`` and written by a background thread to
+    JSON Lines segments, rotating to a new segment once ``segment_max_bytes``
+    is reached. The writer flushes when ``batch_size`` records are queued or
+    every ``flush_interval`` seconds. A per-user index of (segment, offset,
+    length) entries serves ``get(user_id)`` without scanning the log.
+
+    Each process appends only to segments of its own
+    (``history-<pid>-<token>-<n>.jsonl``), so several workers can share the
+    directory; reads first index whatever the other writers have appended
+    since. A batch that fails to write is rolled back and retried.
+    """
+
+    def __init__(self, directory, segment_max_bytes=64 * 1024 * 1024, batch_size=256, flush_interval=1.0):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._in_flight = []
+        self._flush_requested = False
+        self._closed = False
+        self.write_errors = 0
+        self.skipped_lines = 0
+
+        self._writer_id = f"{os.getpid()}-{secrets.token_hex(4)}"
+        self._sequence = 0
+        self._current = None
+        self._own = set()
+        self._index = {}
+        self._segments = []
+        self._committed = {}
+        self._scan_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+        self._writer = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # --- Index ---
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, segment)
+
+    def _parse(self, data, start, segment):
+        """(user_id, entry) per complete line of ``data``; malformed lines are skipped."""
+        entries = []
+        offset = start
+        for line in data.splitlines(keepends=True):
+            try:
+                user_id = json.loads(line).get("user_id")
+            except (ValueError, AttributeError):
+                self.skipped_lines += 1
+                print(f"Skipping malformed history line in {segment} at byte {offset}")
+            else:
+                entries.append((user_id, (segment, offset, len(line))))
+            offset += len(line)
+        return entries
+
+    def refresh(self):
+        """Index the complete lines other writers have appended since the last look.
+
+        A trailing partial line is either still being written or torn by an
+        unclean shutdown; it is left alone and picked up once it is complete.
+        """
+        pattern = os.path.join(self.directory, f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        with self._scan_lock:
+            for path in sorted(glob.glob(pattern)):
+                segment = os.path.basename(path)
+                with self._cond:
+                    if segment in self._own:
+                        continue
+                    start = self._committed.get(segment, 0)
+                try:
+                    with open(path, "rb") as f:
+                        f.seek(start)
+                        data = f.read()
+                except OSError:
+                    continue
+                data = data[:data.rfind(b"\n") + 1]
+                entries = self._parse(data, start, segment)
+
+                with self._cond:
+                    if segment not in self._committed:
+                        self._segments.append(segment)
+                    for user_id, entry in entries:
+                        self._index.setdefault(user_id, []).append(entry)
+                    self._committed[segment] = start + len(data)
+
+    def is_empty(self):
+        with self._cond:
+            return not self._index and not self._pending and not self._in_flight
+
+    # --- Writer ---
+    def append(self, records):
+        if not records:
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("History sink is closed.")
+            self._pending.extend(records)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.batch_size or self._flush_requested or self._closed,
+                    timeout=self.flush_interval,
+                )
+                if not self._pending:
+                    self._flush_requested = False
+                    self._cond.notify_all()
+                    if self._closed:
+                        return
+                    continue
+                batch, self._pending = self._pending, []
+                self._in_flight = batch
+
+            try:
+                entries = self._write(batch)
+            except Exception as e:
+                entries = None
+                error = e
+
+            with self._cond:
+                self._in_flight = []
+                if entries is None:
+                    # Rolled back in _write: keep the batch queued, ahead of anything newer
+                    self.write_errors += 1
+                    if self._closed:
+                        print(f"Dropping {len(batch)} history records at shutdown: {error}")
+                    else:
+                        print(f"Failed to write recommendation history, will retry: {error}")
+                        self._pending = batch + self._pending
+                else:
+                    for user_id, (segment, offset, length) in entries:
+                        self._index.setdefault(user_id, []).append((segment, offset, length))
+                        self._committed[segment] = offset + length
+                self._cond.notify_all()
+                closed = self._closed
+
+            if entries is None and not closed:
+                time.sleep(self.flush_interval)
+
+    def _new_segment(self):
+        self._sequence += 1
+        segment = f"{SEGMENT_PREFIX}{self._writer_id}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+        with self._cond:
+            self._own.add(segment)
+            self._segments.append(segment)
+            self._committed[segment] = 0
+        return segment
+
+    def _write(self, batch):
+        # Serialise everything first so a bad record cannot leave half a batch on disk
+        lines = []
+        for record in batch:
+            try:
+                lines.append((record, (json.dumps(record, default=_to_json) + "\n").encode("utf-8")))
+            except (TypeError, ValueError) as e:
+                print(f"Dropping history record that cannot be serialised: {e}")
+
+        entries = []
+        # Committed size of every segment this batch touches, to roll back to on failure
+        rollback = {}
+        f = None
+        try:
+            for record, line in lines:
+                if f is None or f.tell() >= self.segment_max_bytes:
+                    if f is not None:
+                        f.flush()
+                        os.fsync(f.fileno())
+                        f.close()
+                        f = None
+                        self._current = self._new_segment()
+                    elif self._current is None:
+                        self._current = self._new_segment()
+                    with self._cond:
+                        rollback[self._current] = self._committed[self._current]
+                    f = open(self._segment_path(self._current), "ab")
+                # Offsets come from the file itself, not from what was last committed
+                offset = f.tell()
+                f.write(line)
+                entries.append((record.get("user_id"), (self._current, offset, len(line))))
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            if f is not None:
+                f.close()
+                f = None
+            for segment, size in rollback.items():
+                with open(self._segment_path(segment), "ab") as g:
+                    g.truncate(size)
+            raise
+        finally:
+            if f is not None:
+                f.close()
+        return entries
+
+    def flush(self):
+        """Block until every record appended so far has been written.
+
+        Raises ``RuntimeError`` if a write fails meanwhile; the records stay
+        queued and the writer keeps retrying them.
+        """
+        with self._cond:
+            errors = self.write_errors
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: (not self._pending and not self._in_flight) or self.write_errors != errors
+            )
+            if self.write_errors != errors:
+                raise RuntimeError("Recommendation history could not be written; it is queued for retry.")
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+
+    # --- Reader ---
+    def get(self, user_id=None):
+        self.refresh()
+        with self._cond:
+            if user_id is None:
+                entries = None
+                committed = [(segment, self._committed[segment]) for segment in self._segments]
+            else:
+                entries = list(self._index.get(user_id, []))
+            unflushed = [
+                r for r in self._in_flight + self._pending
+                if user_id is None or r.get("user_id") == user_id
+            ]
+
+        if entries is None:
+            records = []
+            for segment, size in committed:
+                if size:
+                    with open(self._segment_path(segment), "rb") as f:
+                        data = f.read(size)
+                    records.extend(
+                        json.loads(data[offset:offset + length]) for _, (_, offset, length) in self._parse(data, 0, segment)
+                    )
+            return records + unflushed
+
+        records = []
+        handles = {}
+        try:
+            for segment, offset, length in entries:
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                records.append(json.loads(f.read(length)))
+        finally:
+            for f in handles.values():
+                f.close()
+        return records + unflushed
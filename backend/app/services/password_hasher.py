@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+import numpy as np
+
+from app.core.metrics import latency_summary
+
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class HasherBusyError(Exception):
+    pass
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check_password(password, password_hash):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+# === Bounded Password Hashing ===
+class PasswordHasher:
+    """bcrypt hashing and verification on a dedicated, bounded pool of workers.
+
+    bcrypt releases the GIL while it runs, so ``max_workers`` threads hash in
+    parallel on separate cores without the cost of worker processes. At most
+    ``max_workers`` hashes run and ``max_pending`` more wait; beyond that a
+    call fails immediately with ``HasherBusyError`` instead of queueing, as
+    does one that waits longer than ``timeout`` seconds. A login burst
+    therefore occupies at most ``max_workers`` cores. Latencies (queue wait
+    plus bcrypt time) are kept for ``metrics``.
+    """
+
+    def __init__(self, rounds=12, max_workers=2, max_pending=16, timeout=5.0, window=10000):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._latencies = deque(maxlen=window)
+        self._queue_times = deque(maxlen=window)
+
+    def hash(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def verify(self, password, password_hash):
+        return self._run(_check_password, password, password_hash)
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HasherBusyError("Too many password operations in progress, try again shortly.")
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        future = self._executor.submit(_timed, fn, *args)
+        # The slot is held until the work finishes, even if the caller gave up waiting
+        future.add_done_callback(self._release)
+
+        try:
+            result, compute_time = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise HasherBusyError(f"Password operation did not finish within {self.timeout}s.")
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._completed += 1
+            self._histogram[int(np.searchsorted(LATENCY_BUCKETS_MS, latency * 1000))] += 1
+            self._latencies.append(latency)
+            self._queue_times.append(latency - compute_time)
+        return result
+
+    def metrics(self):
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "latency_histogram": dict(zip(labels, self._histogram)),
+                "latency": latency_summary(list(self._latencies)),
+                "queue_time": latency_summary(list(self._queue_times)),
+            }
+
+
+# Shared by every auth request in the process
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS", 12)),
+    max_workers=int(os.getenv("HASH_WORKERS", 2)),
+    max_pending=int(os.getenv("HASH_QUEUE_SIZE", 16)),
+    timeout=float(os.getenv("HASH_TIMEOUT", 5.0)),
+)
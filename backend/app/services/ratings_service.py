@@ -1,15 +1,36 @@
-import pandas as pd
+import os
 
-INTERACTIONS_FILE = "app/data/cleaned_interactions.csv"
+from app.core.model_registry import registry
+from app.core.result_cache import invalidate_user
+from app.data.training_interactions import RATINGS_DB_PATH
+from app.services.ratings_store import RatingsStore
+
+# Ratings submitted through the API; the training CSV stays read-only and
+# data/training_interactions.py exports them for the next retrain
+ratings_store = RatingsStore(
+    RATINGS_DB_PATH,
+    batch_size=int(os.getenv("RATINGS_BATCH_SIZE", 64)),
+    flush_interval=float(os.getenv("RATINGS_FLUSH_INTERVAL", 0.05)),
+)
 
 def store_rating(user_id, item_id, rating):
-    df = pd.read_csv(INTERACTIONS_FILE)
+    # Returns once the rating is committed; concurrent ratings share one commit
+    ratings_store.append(user_id, item_id, rating)
+
+    # Make the new interaction visible to the in-memory index without a rebuild
+    interaction_index = registry.get_if_loaded("interaction_index")
+    if interaction_index is not None:
+        interaction_index.append(user_id, item_id)
+
+    # Fold the rating into the user's SVD factors so the next request is personalised
+    scorer = registry.get_if_loaded("svd_scorer")
+    if scorer is not None:
+        scorer.fold_in(user_id, [(item_id, rating)])
 
-    new_entry = pd.DataFrame([{
-        "user_id": user_id,
-        "item_id": item_id,
-        "interaction": rating
-    }])
+    # Cached rankings for this user no longer reflect their interactions
+    invalidate_user(user_id)
 
-    updated_df = pd.concat([df, new_entry], ignore_index=True)
-    updated_df.to_csv(INTERACTIONS_FILE, index=False)
+    # Keep the per-cluster popularity tables current without a rebuild
+    cluster_tables = registry.get_if_loaded("cluster_tables")
+    if cluster_tables is not None:
+        cluster_tables.record_interaction(user_id, item_id)
@@ -0,0 +1,197 @@
+import os
+import atexit
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id NOT NULL,
+    item_id NOT NULL,
+    interaction REAL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_user ON interactions (user_id);
+"""
+
+
+def _to_sql(value):
+    # Ids arriving as numpy scalars are stored as their plain Python value
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def read_ratings(path, after_id=0):
+    """Committed ratings with an id above ``after_id`` as a (user_id, item_id, interaction)
+    DataFrame indexed by rating id, oldest first. Reads without starting a writer."""
+    with closing(sqlite3.connect(path, timeout=30)) as conn:
+        return pd.read_sql_query(
+            "SELECT id, user_id, item_id, interaction FROM interactions WHERE id > ? ORDER BY id",
+            conn, params=(int(after_id),), index_col="id",
+        )
+
+
+class _Ticket:
+    __slots__ = ("row", "done", "error")
+
+    def __init__(self, row):
+        self.row = row
+        self.done = False
+        self.error = None
+
+
+# === Durable Ratings Store ===
+class RatingsStore:
+    """Append-only ratings log in SQLite (WAL mode) with group commits.
+
+    ``append`` queues a rating for a single background writer and, by default,
+    blocks until the transaction containing it has committed. Ratings arriving
+    while a commit is in progress are committed together in the next one
+    (up to ``batch_size`` per transaction), so concurrent raters share a
+    single fsync and no write is lost. With ``wait=False`` the caller returns
+    immediately and the row is committed within ``flush_interval`` seconds.
+    Each write costs O(batch), independent of how many ratings are stored.
+    """
+
+    def __init__(self, path, batch_size=64, flush_interval=0.05, synchronous="FULL"):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._in_flight = []
+        self._waiters = 0
+        self._flush_requested = False
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._run, name="ratings-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        return conn
+
+    # --- Writer ---
+    def append(self, user_id, item_id, rating, wait=True):
+        """Queue one rating; with ``wait`` block until it is durably committed."""
+        row = (_to_sql(user_id), _to_sql(item_id), float(rating), datetime.utcnow().isoformat())
+        return self.append_many([row], wait=wait)
+
+    def append_many(self, rows, wait=True):
+        """Queue (user_id, item_id, rating[, created_at]) rows to be committed together."""
+        tickets = []
+        for row in rows:
+            if len(row) == 3:
+                row = (_to_sql(row[0]), _to_sql(row[1]), float(row[2]), datetime.utcnow().isoformat())
+            tickets.append(_Ticket(row))
+        if not tickets:
+            return
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Ratings store is closed.")
+            self._pending.extend(tickets)
+            if not wait:
+                if len(self._pending) >= self.batch_size:
+                    self._cond.notify_all()
+                return
+
+            self._waiters += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: all(t.done for t in tickets))
+            finally:
+                self._waiters -= 1
+
+        errors = [t.error for t in tickets if t.error is not None]
+        if errors:
+            raise errors[0]
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: (self._pending and (self._waiters or len(self._pending) >= self.batch_size))
+                        or self._flush_requested or self._closed,
+                        timeout=self.flush_interval,
+                    )
+                    if not self._pending:
+                        self._flush_requested = False
+                        self._cond.notify_all()
+                        if self._closed:
+                            return
+                        continue
+                    batch = self._pending[:self.batch_size]
+                    self._pending = self._pending[self.batch_size:]
+                    self._in_flight = batch
+
+                error = None
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO interactions (user_id, item_id, interaction, created_at) VALUES (?, ?, ?, ?)",
+                            [t.row for t in batch],
+                        )
+                except Exception as e:
+                    print(f"Failed to commit ratings: {e}")
+                    error = e
+
+                with self._cond:
+                    for ticket in batch:
+                        ticket.error = error
+                        ticket.done = True
+                    self._in_flight = []
+                    self._cond.notify_all()
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Block until every rating appended so far has been committed."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: not self._pending and not self._in_flight)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+
+    # --- Reader ---
+    def to_frame(self, after_id=0):
+        """Committed ratings newer than ``after_id`` (all by default); see ``read_ratings``.
+
+        Artifacts record the last rating id they were trained on, so a load
+        only replays the ratings that arrived after it.
+        """
+        return read_ratings(self.path, after_id)
+
+    def get(self, user_id):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT item_id, interaction, created_at FROM interactions WHERE user_id = ? ORDER BY id",
+                (_to_sql(user_id),),
+            ).fetchall()
+        return [{"item_id": item_id, "interaction": rating, "created_at": created_at} for item_id, rating, created_at in rows]
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
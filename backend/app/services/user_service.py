@@ -1,93 +1,126 @@
-import bcrypt
 from typing import Optional, Tuple, Dict, Any
 import mysql.connector
-from app.utils.db import connect_to_db
+from app.utils.db import get_connection
+from app.services.password_hasher import password_hasher
+
+# Hashing runs on password_hasher's bounded pool and raises HasherBusyError
+# when it is saturated; callers turn that into a retryable response.
+
+
+class UserLookupError(Exception):
+    pass
 
 
 def register_user(username: str, email: str, password: str) -> Tuple[bool, str]:
-    conn = connect_to_db()
-    if conn is None:
-        return False, "Database connection failed."
+    # Hashed before checking out a connection, so a queued hash never holds one
+    hashed_pw = password_hasher.hash(password)
 
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute(
-            "SELECT id FROM users WHERE email = %s OR username = %s",
-            (email.lower(), username)
-        )
-        if cursor.fetchone():
-            return False, "User already exists with this email or username."
+    with get_connection() as conn:
+        if conn is None:
+            return False, "Database connection failed."
 
-        hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(
+                "SELECT id FROM users WHERE email = %s OR username = %s",
+                (email.lower(), username)
+            )
+            if cursor.fetchone():
+                return False, "User already exists with this email or username."
 
-        cursor.execute("""
-            INSERT INTO users (username, email, password_hash)
-            VALUES (%s, %s, %s)
-        """, (username, email.lower(), hashed_pw))
+            cursor.execute("""
+                INSERT INTO users (username, email, password_hash)
+                VALUES (%s, %s, %s)
+            """, (username, email.lower(), hashed_pw))
 
-        conn.commit()
-        return True, "User registered successfully."
+            conn.commit()
+            return True, "User registered successfully."
 
-    except mysql.connector.Error as e:
-        return False, f"MySQL error: {e}"
+        except mysql.connector.Error as e:
+            return False, f"MySQL error: {e}"
 
-    finally:
-        cursor.close()
-        conn.close()
+        finally:
+            cursor.close()
 
 
 def authenticate_user(email: str, password: str) -> Optional[Dict[str, Any]]:
-    conn = connect_to_db()
-    if conn is None:
-        return None
+    with get_connection() as conn:
+        if conn is None:
+            return None
 
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute("""
-            SELECT id, username, email, password_hash
-            FROM users
-            WHERE email = %s
-        """, (email.lower(),))
-        user = cursor.fetchone()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT id, username, email, password_hash
+                FROM users
+                WHERE email = %s
+            """, (email.lower(),))
+            user = cursor.fetchone()
 
-        if user and bcrypt.checkpw(password.encode('utf-8'), user["password_hash"].encode('utf-8')):
-            return {
-                "id": user["id"],
-                "username": user["username"],
-                "email": user["email"]
-            }
+        except mysql.connector.Error:
+            return None
 
-        return None
+        finally:
+            cursor.close()
 
-    except mysql.connector.Error:
-        return None
+    # Verified after the connection is back in the pool, so a queued check never holds one
+    if user and password_hasher.verify(password, user["password_hash"]):
+        return {
+            "id": user["id"],
+            "username": user["username"],
+            "email": user["email"]
+        }
 
-    finally:
-        cursor.close()
-        conn.close()
+    return None
 
 
 def update_password(email: str, new_password: str) -> Tuple[bool, str]:
-    conn = connect_to_db()
-    if conn is None:
-        return False, "Database connection failed."
+    hashed_pw = password_hasher.hash(new_password)
+
+    with get_connection() as conn:
+        if conn is None:
+            return False, "Database connection failed."
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE users SET password_hash = %s WHERE email = %s
+            """, (hashed_pw, email.lower()))
+            conn.commit()
+
+            if cursor.rowcount == 0:
+                return False, "No user found with this email."
+
+            return True, "Password updated successfully."
+
+        except mysql.connector.Error as e:
+            return False, f"MySQL error: {e}"
+
+        finally:
+            cursor.close()
+
 
-    cursor = conn.cursor()
-    try:
-        hashed_pw = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        cursor.execute("""
-            UPDATE users SET password_hash = %s WHERE email = %s
-        """, (hashed_pw, email.lower()))
-        conn.commit()
+def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
+    """The user row, or None if there is no such user.
 
-        if cursor.rowcount == 0:
-            return False, "No user found with this email."
+    Raises ``UserLookupError`` when the database cannot be reached, so an
+    outage is not mistaken for a missing user.
+    """
+    with get_connection() as conn:
+        if conn is None:
+            raise UserLookupError("Database connection failed.")
 
-        return True, "Password updated successfully."
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT id, username, email
+                FROM users
+                WHERE id = %s
+            """, (user_id,))
+            return cursor.fetchone()
 
-    except mysql.connector.Error as e:
-        return False, f"MySQL error: {e}"
+        except mysql.connector.Error as e:
+            raise UserLookupError(f"MySQL error: {e}") from e
 
-    finally:
-        cursor.close()
-        conn.close()
+        finally:
+            cursor.close()
@@ -1,14 +1,27 @@
+import os
+import sys
+import numpy as np
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.core.bundle_optimizer import optimize_bundle
+from app.core.interaction_index import InteractionIndex, interaction_matrix
+
 # === PATH TO DATA ===
 CSV_PATH = r'C:\Users\Suzette Benjamin\Documents\Group Project\TailoredTravel\backend\app\data\cleaned_feature_hybrid_dataset.csv'
 
 # === LOAD DATA ===
 df = pd.read_csv(CSV_PATH)
 
+# User -> items adjacency, built once instead of masking df per lookup
+interaction_index = InteractionIndex.from_frame(df)
+
+# Sparse users x items matrix (rows user_ids, columns item_ids) instead of a dense pivot table
+user_item_matrix, matrix_user_ids, matrix_item_ids = interaction_matrix(df)
+
 # === CLUSTERING LOGIC ===
 def perform_clustering(data, n_clusters=5):
     clustering_features = ['price', 'age']  # Can expand if needed
@@ -29,7 +42,7 @@ def get_user_cluster_recommendations(user_id, df_clustered):
 
 # === CONTENT-BASED FILTERING ===
 def get_cb_recommendations(user_id, df):
-    user_items = df[df['user_id'] == user_id]['item_id'].unique()
+    user_items = interaction_index.items_of(user_id)
     item_features = df[['item_id', 'destination', 'accommodation_type']].drop_duplicates()
 
     # One-hot encode text features
@@ -49,21 +62,23 @@ def get_cb_recommendations(user_id, df):
 
 # === COLLABORATIVE FILTERING ===
 def get_cf_recommendations(user_id, df):
-    interaction_matrix = df.pivot_table(index='user_id', columns='item_id', values='interaction').fillna(0)
-    if user_id not in interaction_matrix.index:
+    # The matrix drops users whose interactions are all missing, so check it rather than the index
+    if user_id not in matrix_user_ids:
         return pd.DataFrame()
-    user_vector = interaction_matrix.loc[user_id].values.reshape(1, -1)
-    similarity = cosine_similarity(user_vector, interaction_matrix.values)[0]
-    similarity_series = pd.Series(similarity, index=interaction_matrix.index).drop(user_id)
+    # Only this user's row against the sparse matrix: O(users) similarities, no users x users matrix
+    user_vector = user_item_matrix[matrix_user_ids.get_loc(user_id)]
+    similarity = cosine_similarity(user_vector, user_item_matrix)[0]
+    similarity_series = pd.Series(similarity, index=matrix_user_ids).drop(user_id)
 
     similar_users = similarity_series.sort_values(ascending=False).head(3).index
-    recommended_items = interaction_matrix.loc[similar_users].mean().sort_values(ascending=False)
+    similar_rows = user_item_matrix[matrix_user_ids.get_indexer(similar_users)]
+    recommended_items = pd.Series(np.asarray(similar_rows.mean(axis=0)).ravel(), index=matrix_item_ids).sort_values(ascending=False)
     recommended_items = recommended_items[recommended_items > 0].head(10).index
 
     return df[df['item_id'].isin(recommended_items)][['item_id', 'destination', 'accommodation_type', 'price']].drop_duplicates()
 
 # === MAIN RECOMMENDER ===
-def recommend_items(user_id, budget=3000.0):
+def recommend_items(user_id, budget=3000.0, k=3):
     # Step 1: Cluster the data
     clustered_df, _, _ = perform_clustering(df.copy())
 
@@ -72,23 +87,29 @@ def recommend_items(user_id, budget=3000.0):
     cf_recs = get_cf_recommendations(user_id, df)
     cluster_recs = get_user_cluster_recommendations(user_id, clustered_df)
 
-    # Step 3: Combine and filter unique recommendations
-    all_recs = pd.concat([cb_recs, cf_recs, cluster_recs]).drop_duplicates('item_id')
-    all_recs = all_recs.sort_values('price')
-    all_recs = all_recs[all_recs['price'] <= budget]
+    # Step 3: Combine into unique items at their cheapest price, scored by how many recommenders proposed them
+    sources = [recs for recs in (cb_recs, cf_recs, cluster_recs) if not recs.empty]
+    if not sources:
+        print("No recommendations found within budget.")
+        return pd.DataFrame(), budget
+    votes = pd.concat([recs['item_id'].drop_duplicates() for recs in sources]).value_counts()
+    all_recs = pd.concat(sources).sort_values('price', kind='stable').drop_duplicates('item_id')
+    all_recs = all_recs.assign(score=all_recs['item_id'].map(votes).to_numpy(dtype=float))
+
+    # Step 4: Best-scoring trip of up to k items whose prices fit the budget together
+    result = optimize_bundle(all_recs['price'].to_numpy(), all_recs['score'].to_numpy(), budget, k)
+    bundle = all_recs.iloc[result['indices']]
 
-    if all_recs.empty:
+    if bundle.empty:
         print("No recommendations found within budget.")
-        return
+        return bundle, budget
 
-    # Step 4: Display top 3
-    top3 = all_recs.head(3)
-    print(f"Top 3 recommendations for '{user_id}' (Budget: ${budget:.2f}):")
-    for idx, row in top3.iterrows():
+    print(f"Top {len(bundle)} recommendations for '{user_id}' (Budget: ${budget:.2f}):")
+    for idx, row in bundle.iterrows():
         print(f"{row['destination']}_{row['accommodation_type']} — ${row['price']:.2f}")
 
-    spent = top3['price'].sum()
-    print(f"\n💰 Remaining budget: ${budget - spent:.2f}")
+    print(f"\n💰 Remaining budget: ${result['remaining_budget']:.2f}")
+    return bundle, result['remaining_budget']
 
 # === RUN EXAMPLE ===
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+# === Stages ===
+class Stage:
+    """One pipeline step: ``target`` is ``"module:function"``.
+
+    The function is called with ``inputs`` and ``outputs`` as keyword
+    arguments (parameter name -> path), so the declared paths are exactly the
+    ones the stage reads and writes. A stage depends on every stage that
+    produces one of its inputs. Its code is the target module plus every
+    module of the same package it imports, directly or not; ``code`` names
+    extra modules it loads some other way.
+    """
+
+    def __init__(self, name, target, inputs=None, outputs=None, code=()):
+        self.name = name
+        self.target = target
+        self.inputs = dict(inputs or {})
+        self.outputs = dict(outputs or {})
+        self.code = tuple(code)
+
+    @property
+    def module(self):
+        return self.target.split(":")[0]
+
+    @property
+    def source_path(self):
+        return importlib.util.find_spec(self.module).origin
+
+    def code_paths(self):
+        """Source files of the target module and its first-party imports, sorted."""
+        package = self.module.split(".")[0]
+        root = os.path.dirname(os.path.dirname(importlib.util.find_spec(package).origin))
+        return sorted(_local_imports([self.module, *self.code], package, root).values())
+
+    def kwargs(self):
+        return {**self.inputs, **self.outputs}
+
+
+def _module_path(root, module):
+    base = os.path.join(root, *module.split("."))
+    for path in (f"{base}.py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _local_imports(modules, package, root):
+    """Module name -> source path for ``modules`` and everything of ``package`` they import."""
+    found = {}
+    stack = list(modules)
+    while stack:
+        module = stack.pop()
+        if module in found:
+            continue
+        path = _module_path(root, module)
+        if path is None:
+            continue
+        found[module] = path
+
+        # Importing a submodule runs its parent packages' __init__ too
+        parts = module.split(".")
+        stack.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+        is_package = path.endswith("__init__.py")
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                stack.extend(alias.name for alias in node.names if alias.name.split(".")[0] == package)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    anchor = parts if is_package else parts[:-1]
+                    anchor = anchor[:len(anchor) - node.level + 1]
+                    base = ".".join(anchor + ([node.module] if node.module else []))
+                else:
+                    base = node.module or ""
+                if base.split(".")[0] != package:
+                    continue
+                stack.append(base)
+                # ``from app.data import cleaning`` imports a module, not a name
+                stack.extend(f"{base}.{alias.name}" for alias in node.names)
+    return found
+
+
+def _hash_path(digest, path):
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                _hash_path(digest, file_path)
+    elif os.path.isfile(path):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    else:
+        digest.update(b"<missing>")
+
+
+def fingerprint(stage):
+    """Content hash of the stage's code (its module and first-party imports) and every input it declares."""
+    digest = hashlib.sha256(stage.target.encode())
+    for path in [*stage.code_paths(), *sorted(stage.inputs.values())]:
+        digest.update(path.encode())
+        _hash_path(digest, path)
+    return digest.hexdigest()
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_stage(target, kwargs):
+    module_name, function_name = target.split(":")
+    started = time.perf_counter()
+    getattr(importlib.import_module(module_name), function_name)(**kwargs)
+    return time.perf_counter() - started, _peak_memory_mb()
+
+
+# === Runner ===
+class Pipeline:
+    """Runs stages in dependency order, independent stages in parallel.
+
+    Each stage runs in a fresh worker process, so the peak RSS reported for it
+    is its own. A stage is skipped when its fingerprint (code + input content
+    hashes) matches the last successful run and all its outputs exist. A
+    failed stage marks everything downstream of it as blocked.
+    """
+
+    def __init__(self, stages, state_path, max_workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers or min(len(self.stages), os.cpu_count() or 1)
+        self.dependencies = self._resolve_dependencies()
+
+    def _resolve_dependencies(self):
+        producers = {}
+        for stage in self.stages.values():
+            for path in stage.outputs.values():
+                producers[os.path.normcase(os.path.abspath(path))] = stage.name
+
+        dependencies = {}
+        for stage in self.stages.values():
+            dependencies[stage.name] = {
+                producers[key] for key in (os.path.normcase(os.path.abspath(p)) for p in stage.inputs.values())
+                if key in producers and producers[key] != stage.name
+            }
+        return dependencies
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, force=False):
+        state = self._load_state()
+        results = {}
+        running = {}
+        hashes = {}
+
+        # "spawn" so each stage starts from a clean interpreter (and a clean ru_maxrss)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as executor:
+            while len(results) < len(self.stages):
+                progressed = False
+                for name, stage in self.stages.items():
+                    if name in results or name in running.values():
+                        continue
+                    statuses = [results.get(dep, {}).get("status") for dep in self.dependencies[name]]
+                    if any(status in ("failed", "blocked") for status in statuses):
+                        results[name] = {"status": "blocked"}
+                        progressed = True
+                        continue
+                    if not all(status in ("ran", "skipped") for status in statuses):
+                        continue
+
+                    stage_hash = fingerprint(stage)
+                    outputs_exist = all(os.path.exists(path) for path in stage.outputs.values())
+                    if not force and outputs_exist and state.get(name) == stage_hash:
+                        results[name] = {"status": "skipped"}
+                        progressed = True
+                        continue
+
+                    print(f"\n🚀 Running {name} ...")
+                    running[executor.submit(_run_stage, stage.target, stage.kwargs())] = name
+                    hashes[name] = stage_hash
+
+                if not running:
+                    if not progressed:
+                        raise ValueError(f"Dependency cycle between stages: {sorted(set(self.stages) - set(results))}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        wall_time, peak_mb = future.result()
+                    except Exception as e:
+                        print(f"❌ {name} failed: {e}")
+                        results[name] = {"status": "failed", "error": str(e)}
+                        continue
+                    print(f"✅ {name} done in {wall_time:.2f}s.")
+                    results[name] = {"status": "ran", "wall_time_s": wall_time, "peak_memory_mb": peak_mb}
+                    state[name] = hashes[name]
+                    self._save_state(state)
+
+        return {name: results[name] for name in self.stages}
+
+
+def format_report(results):
+    lines = [f"{'stage':<16}{'status':<10}{'wall (s)':>10}{'peak (MB)':>12}"]
+    for name, result in results.items():
+        wall_time = result.get("wall_time_s")
+        peak_mb = result.get("peak_memory_mb")
+        lines.append(
+            f"{name:<16}{result['status']:<10}"
+            f"{f'{wall_time:.2f}' if wall_time is not None else '-':>10}"
+            f"{f'{peak_mb:.1f}' if peak_mb is not None else '-':>12}"
+        )
+    return "\n".join(lines)
@@ -1,14 +1,19 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Input, Embedding, Flatten, Dot
 from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.models import save_model
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.data.training_interactions import load_training_interactions
+from app.recommenders.cf_embeddings import CFEmbeddingScorer
 
-# Load interactions
-interactions = pd.read_csv('../data/cleaned_interactions.csv')
+
+# Load interactions (with the ratings exported from the store)
+interactions, _ = load_training_interactions()
 
 # Encode user and item IDs
 user_ids = interactions['user_id'].astype("category").cat.codes.values
@@ -21,8 +26,10 @@ num_items = len(set(item_ids))
 # Build simple matrix factorization model
 user_input = Input(shape=(1,))
 item_input = Input(shape=(1,))
-user_vec = Embedding(num_users, 50)(user_input)
-item_vec = Embedding(num_items, 50)(item_input)
+user_embedding = Embedding(num_users, 50)
+item_embedding = Embedding(num_items, 50)
+user_vec = user_embedding(user_input)
+item_vec = item_embedding(item_input)
 user_vec = Flatten()(user_vec)
 item_vec = Flatten()(item_vec)
 dot = Dot(axes=1)([user_vec, item_vec])
@@ -36,4 +43,12 @@ model.fit([user_ids, item_ids], ratings, epochs=5, batch_size=64, verbose=1)
 # Save model
 os.makedirs('../models', exist_ok=True)
 model.save('../models/cf_model.h5')
+
+# Embedding tables + vocabularies for the NumPy-only serving path
+CFEmbeddingScorer(
+    user_embedding.get_weights()[0],
+    item_embedding.get_weights()[0],
+    interactions['user_id'].astype("category").cat.categories,
+    interactions['item_id'].astype("category").cat.categories,
+).save('../models/cf_embeddings')
 print("CF model trained and saved.")
\ No newline at end of file
@@ -1,57 +1,70 @@
-import pandas as pd
 import os
-import pickle
+import sys
 from surprise import SVD, Dataset, Reader
 from surprise.model_selection import train_test_split
 from surprise import accuracy
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.core.artifacts import is_artifact, load_artifact, load_frame
+from app.core.svd_scorer import SVDScorer
+
 # ---------- CONFIG ----------
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-DATA_PATH = os.path.join(BASE_DIR, "data", "cleaned_ratings_data.csv")
+# Columnar handoff from data/cleanup_dataset.py (load_frame also accepts a CSV)
+DATA_PATH = os.path.join(BASE_DIR, "data", "pipeline", "cleaned_ratings_data")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
-MODEL_PATH = os.path.join(MODEL_DIR, "svd_model.pkl")
+MODEL_PATH = os.path.join(MODEL_DIR, "svd_model")
+
+
+def train_collaborative(data_path=DATA_PATH, model_path=MODEL_PATH):
+    # ---------- STEP 1: Load Preprocessed Ratings Data ----------
+
+    print("Loading dataset...")
+    df = load_frame(data_path)
+    # Id of the last stored rating in the data; serving folds in only the ones after it
+    ratings_through = load_artifact(data_path).get("ratings_through", 0) if is_artifact(data_path) else 0
 
-# ---------- STEP 1: Load Preprocessed Ratings Data ----------
+    # Check required columns
+    required_cols = {"user_id", "item_id", "rating"}
+    if not required_cols.issubset(df.columns):
+        raise ValueError(f"❌ Missing required columns. Found columns: {list(df.columns)}")
 
-print("Loading dataset...")
-df = pd.read_csv(DATA_PATH)
+    # Optional: Clip ratings to ensure within 1–5 range
+    df["rating"] = df["rating"].clip(lower=1.0, upper=5.0)
 
-# Check required columns
-required_cols = {"user_id", "item_id", "rating"}
-if not required_cols.issubset(df.columns):
-    raise ValueError(f"❌ Missing required columns. Found columns: {list(df.columns)}")
+    # ---------- STEP 2: Prepare Data for Surprise ----------
 
-# Optional: Clip ratings to ensure within 1–5 range
-df["rating"] = df["rating"].clip(lower=1.0, upper=5.0)
+    print("Preparing data for training...")
+    reader = Reader(rating_scale=(1, 5))
+    data = Dataset.load_from_df(df[["user_id", "item_id", "rating"]], reader)
+    trainset, testset = train_test_split(data, test_size=0.2, random_state=42)
 
-# ---------- STEP 2: Prepare Data for Surprise ----------
+    # ---------- STEP 3: Train SVD Collaborative Filtering Model ----------
 
-print("Preparing data for training...")
-reader = Reader(rating_scale=(1, 5))
-data = Dataset.load_from_df(df[["user_id", "item_id", "rating"]], reader)
-trainset, testset = train_test_split(data, test_size=0.2, random_state=42)
+    print("Training SVD collaborative filtering model...")
+    model = SVD()
+    model.fit(trainset)
 
-# ---------- STEP 3: Train SVD Collaborative Filtering Model ----------
+    # ---------- STEP 4: Evaluate Model ----------
 
-print("Training SVD collaborative filtering model...")
-model = SVD()
-model.fit(trainset)
+    print("Evaluating model...")
+    predictions = model.test(testset)
+    rmse = accuracy.rmse(predictions)
+    print(f"Test RMSE: {rmse:.4f}")
 
-# ---------- STEP 4: Evaluate Model ----------
+    # ---------- STEP 5: Save Trained Model ----------
 
-print("Evaluating model...")
-predictions = model.test(testset)
-rmse = accuracy.rmse(predictions)
-print(f"Test RMSE: {rmse:.4f}")
+    print("Saving model...")
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
-# ---------- STEP 5: Save Trained Model ----------
+    # Factors are stored as memory-mapped arrays, the serving path never unpickles the model
+    SVDScorer.from_surprise(model, ratings_through=ratings_through).save(model_path)
 
-print("Saving model...")
-os.makedirs(MODEL_DIR, exist_ok=True)
+    print("Collaborative Filtering model trained and saved successfully at:")
+    print(f"   {model_path}")
+    return model
 
-with open(MODEL_PATH, "wb") as f:
-    pickle.dump(model, f)
 
-print("Collaborative Filtering model trained and saved successfully at:")
-print(f"   {MODEL_PATH}")
+if __name__ == "__main__":
+    train_collaborative()
@@ -1,5 +1,9 @@
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.data.training_interactions import load_training_interactions
 
 # Set up proper data path
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -7,7 +11,7 @@ DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
 
 # Load data
 items_df = pd.read_csv(os.path.join(DATA_DIR, "cleaned_items.csv"))
-interactions_df = pd.read_csv(os.path.join(DATA_DIR, "cleaned_interactions.csv"))
+interactions_df, _ = load_training_interactions()
 users_df = pd.read_csv(os.path.join(DATA_DIR, "user_features.csv"))
 
 # Show loaded columns
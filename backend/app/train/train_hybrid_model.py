@@ -1,11 +1,15 @@
 import os
 import pandas as pd
 import numpy as np
-import pickle
+import sys
 from sklearn.preprocessing import LabelEncoder, MinMaxScaler
 from sklearn.decomposition import TruncatedSVD
 from recommenders.clustering_model import train_clustering
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from app.core.artifacts import save_artifact
+from app.core.interaction_index import interaction_matrix
+
 # Load cleaned dataset
 
 data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'cleaned_feature_hybrid_dataset.csv')
@@ -32,13 +36,14 @@ df['accommodation_idx'] = accommodation_encoder.fit_transform(df['accommodation_
 # -----------------------------
 # Step 2: Create user-item interaction matrix
 # -----------------------------
-interaction_matrix = df.pivot_table(index='user_idx', columns='item_idx', values='interaction', fill_value=0)
+# Sparse CSR from the integer codes; memory grows with interactions, not users x items
+user_item_matrix, _, _ = interaction_matrix(df, user_column='user_idx', item_column='item_idx')
 
 # -----------------------------
 # Step 3: Apply SVD for collaborative filtering
 # -----------------------------
 svd = TruncatedSVD(n_components=50, random_state=42)
-user_factors = svd.fit_transform(interaction_matrix)
+user_factors = svd.fit_transform(user_item_matrix)
 item_factors = svd.components_.T
 
 # -----------------------------
@@ -76,7 +81,6 @@ model_data = {
     'user_clusters': df_with_clusters[['user_id', 'cluster']]
 }
 
-with open('models/hybrid_model.pkl', 'wb') as f:
-    pickle.dump(model_data, f)
+save_artifact('models/hybrid_model', model_data, kind="hybrid")
 
-print("Hybrid recommendation model trained and saved to ../models/hybrid_model.pkl")
+print("Hybrid recommendation model trained and saved to ../models/hybrid_model")
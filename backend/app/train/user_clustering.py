@@ -6,12 +6,18 @@ from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 import joblib
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.data.training_interactions import load_training_interactions
+from app.recommenders.clustering_model import ClusterTables, save_cluster_tables
 
 # === CONFIGURATION ===
 NUM_CLUSTERS = 5
 CLUSTER_MODEL_PATH = "../models/clustering_model.pkl"
 PREPROCESSOR_PATH = "../models/user_preprocessor.pkl"
 DATASET_PATH = "../data/feature_hybrid_dataset.csv"
+CLUSTER_TABLES_PATH = "../models/cluster_tables.pkl"
 
 # Ensure the models directory exists
 os.makedirs(os.path.dirname(CLUSTER_MODEL_PATH), exist_ok=True)
@@ -98,6 +104,12 @@ if __name__ == "__main__":
     top_items_by_cluster = get_top_items_per_cluster(clustered_df, item_data)
     print(f"[INFO] Top items by cluster:\n{top_items_by_cluster}")
 
+    # Precompute serving tables (user -> cluster, cluster -> ranked items) for the API
+    interactions_df, ratings_through = load_training_interactions()
+    cluster_tables = ClusterTables.from_assignments(clustered_df, interactions_df, ratings_through=ratings_through)
+    save_cluster_tables(cluster_tables, CLUSTER_TABLES_PATH)
+    print(f"[INFO] Cluster tables saved at {CLUSTER_TABLES_PATH}")
+
     # Example of generating recommendations for a specific user
     user_id = "John Smith"  # Replace with an actual user ID
     recommendations = get_cluster_recommendations(user_id, clustered_df, top_items_by_cluster)
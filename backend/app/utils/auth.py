@@ -0,0 +1,107 @@
+import functools
+import hashlib
+import os
+import time
+
+from flask import g, jsonify, request
+
+from app.core.result_cache import TTLCache
+from app.services.user_service import UserLookupError, get_user_by_id
+from app.utils.jwt_util import decode_jwt
+
+# Reject requests without a bearer token (auth routes and preflights excepted)
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "").lower() in ("1", "true", "yes")
+PUBLIC_BLUEPRINTS = {"auth"}
+
+# === Verified Session Cache ===
+# Token digest -> (claims, user). An entry lives until the token's ``exp`` and
+# at most AUTH_CACHE_TTL seconds, after which the user row is fetched again.
+session_cache = TTLCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", 300)),
+)
+
+
+def _token_key(token):
+    # Only digests are kept, never the bearer tokens themselves
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def verify_token(token):
+    """Return the user a bearer token belongs to, or None if it is invalid or expired.
+
+    ``UserLookupError`` from the user lookup propagates: the token may be fine.
+    """
+    key = _token_key(token)
+    session = session_cache.get(key)
+    if session is not None:
+        claims, user = session
+        # Entries are cut at ``exp`` already; this covers a token expiring within a lookup
+        if claims.get("exp") is None or claims["exp"] > time.time():
+            return user
+
+    claims = decode_jwt(token)
+    if claims is None or "user_id" not in claims:
+        return None
+    user = get_user_by_id(claims["user_id"])
+    if user is None:
+        return None
+
+    ttl = claims["exp"] - time.time() if "exp" in claims else None
+    if ttl is None or ttl > 0:
+        session_cache.set(key, (claims, user), ttl=ttl)
+    return user
+
+
+def _bearer_token():
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def authenticate_request():
+    """``before_request`` hook: attach the token's user to ``g.user`` (None if anonymous)."""
+    g.user = None
+    if request.method == "OPTIONS":
+        return None
+
+    token = _bearer_token()
+    if token is None:
+        if AUTH_REQUIRED and request.blueprint not in PUBLIC_BLUEPRINTS and request.endpoint != "home":
+            return jsonify({"error": "Authorization token is required."}), 401
+        return None
+
+    try:
+        user = verify_token(token)
+    except UserLookupError as e:
+        # The database is down, not the token: ask the client to retry
+        print(f"Token user lookup failed: {e}")
+        response = jsonify({"error": "Authentication is temporarily unavailable."})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+    if user is None:
+        return jsonify({"error": "Invalid or expired token."}), 401
+    g.user = user
+    return None
+
+
+def request_user_id(supplied=None):
+    """The authenticated user's id, falling back to ``supplied`` for anonymous requests."""
+    user = g.get("user")
+    return user["id"] if user else supplied
+
+
+def login_required(view):
+    """Answer 401 unless the request carried a valid token, whatever ``AUTH_REQUIRED`` says."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if g.get("user") is None:
+            return jsonify({"error": "Authorization token is required."}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_auth(app):
+    app.before_request(authenticate_request)
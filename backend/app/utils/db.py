@@ -1,21 +1,192 @@
 # app/utils/db.py
 import mysql.connector
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _connect():
+    return mysql.connector.connect(
+        host=os.getenv("MYSQL_HOST"),
+        user=os.getenv("MYSQL_USER"),
+        password=os.getenv("MYSQL_PASSWORD"),
+        database=os.getenv("MYSQL_DB")
+    )
+
+
 def connect_to_db():
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST"),
-            user=os.getenv("MYSQL_USER"),
-            password=os.getenv("MYSQL_PASSWORD"),
-            database=os.getenv("MYSQL_DB")
-        )
-        if connection.is_connected():
-            print("Successfully connected to the MySQL database.")
-        return connection
+        return _connect()
     except mysql.connector.Error as e:
         print(f"Database connection failed: {e}")
         return None
+
+
+# === Connection Pool ===
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Process-wide pool of DB connections.
+
+    ``connect`` is any zero-argument callable returning a DB-API connection
+    (``mysql.connector.connect`` in production, a fake in tests). Connections
+    are created lazily up to ``size``, health-checked on checkout, and rolled
+    back when returned so no transaction snapshot leaks between requests.
+    """
+
+    def __init__(self, connect, size=5, checkout_timeout=10.0):
+        self.connect = connect
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._open = 0
+        self._in_use = 0
+
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._open -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.checkout_timeout
+        while True:
+            conn = None
+            with self._cond:
+                if not self._idle and self._open >= self.size:
+                    self._waits += 1
+                    while not self._idle and self._open >= self.size:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeoutError(f"No database connection available within {self.checkout_timeout}s")
+                        self._cond.wait(remaining)
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._open += 1
+
+            if conn is None:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                self._in_use += 1
+                self._checkouts += 1
+                self._checkout_time_total += elapsed
+                self._checkout_time_max = max(self._checkout_time_max, elapsed)
+            return conn
+
+    def release(self, conn):
+        with self._cond:
+            self._in_use -= 1
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "avg_checkout_ms": (self._checkout_time_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                "max_checkout_ms": self._checkout_time_max * 1000,
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    size=int(os.getenv("MYSQL_POOL_SIZE", 5)),
+                    checkout_timeout=float(os.getenv("MYSQL_POOL_TIMEOUT", 10.0)),
+                )
+    return _pool
+
+
+@contextmanager
+def get_connection():
+    """Check a pooled connection out for the duration of the block (None if unavailable)."""
+    pool = get_pool()
+    try:
+        conn = pool.acquire()
+    except (mysql.connector.Error, PoolTimeoutError) as e:
+        print(f"Database connection failed: {e}")
+        yield None
+        return
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
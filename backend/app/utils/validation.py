@@ -0,0 +1,20 @@
+import math
+
+
+def number_arg(data, key, default=None, cast=float, minimum=None):
+    """``data[key]`` as a finite number (``default`` if absent); raises ValueError on bad input.
+
+    ``data`` is a JSON body or ``request.args``; booleans, NaN and infinities
+    are rejected rather than passed on to the recommenders.
+    """
+    value = data.get(key)
+    if value is None:
+        return default
+    try:
+        number = cast(value) if not isinstance(value, bool) else None
+    except (TypeError, ValueError, OverflowError):
+        number = None
+    if number is None or not math.isfinite(number) or (minimum is not None and number < minimum):
+        bound = f" >= {minimum}" if minimum is not None else ""
+        raise ValueError(f"'{key}' must be a number{bound}.")
+    return number
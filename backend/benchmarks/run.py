@@ -0,0 +1,294 @@
+"""Latency/throughput benchmarks for the recommender paths on synthetic data.
+
+Run from the backend folder:
+
+    python -m benchmarks.run --scales small,medium --output results.json
+    python -m benchmarks.run --scales small --baseline results.json
+
+Each scale generates a synthetic dataset (see ``benchmarks/synthetic.py``),
+installs it in the model registry in place of the CSVs and trained models,
+and calls every path through its public function. Per-path results
+(throughput and p50/p95/p99 latency) are written as JSON; ``--baseline``
+compares p95 latency against an earlier run and exits non-zero on a
+regression.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Ratings and history writes go to a scratch directory, never to app/data.
+# Both paths are read when the services are first imported, hence before the app imports.
+WORK_DIR = tempfile.mkdtemp(prefix="tailoredtravel-bench-")
+os.environ["RATINGS_DB_PATH"] = os.path.join(WORK_DIR, "ratings.db")
+os.environ["HISTORY_DIR"] = os.path.join(WORK_DIR, "recommendation_history")
+
+from app.core.hybrid_recommender import HybridRecommender, hybrid_recommend
+from app.core.model_registry import registry
+from app.core.result_cache import clear_all
+from app.core.svd_scorer import SVDScorer
+from app.recommenders.clustering_model import ClusterTables, get_user_cluster_recommendations
+from app.recommenders.content_based_filtering import get_cb_recommendations
+from app.recommenders.content_model import prepare_cb_model, train_content
+from app.services.history_service import history_sink, save_recommendation_history
+from app.services.ratings_service import ratings_store, store_rating
+from benchmarks.synthetic import SCALES, generate
+
+PERCENTILES = (50, 95, 99)
+BENCHMARKS = [
+    "hybrid_recommend",
+    "fallback_content_based",
+    "get_cb_recommendations",
+    "get_user_cluster_recommendations",
+    "save_recommendation_history",
+    "hybrid_save_history",
+    "store_rating",
+]
+
+
+# === Measurement ===
+def measure(call, n_requests, concurrency=1, warmup=20, finish=None):
+    """Time ``call(i)`` for i in range(n_requests); ``finish`` (e.g. a flush) counts towards throughput."""
+    for i in range(min(warmup, n_requests)):
+        call(i)
+
+    def timed(i):
+        started = time.perf_counter()
+        call(i)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed, range(n_requests)))
+    else:
+        latencies = [timed(i) for i in range(n_requests)]
+    if finish is not None:
+        finish()
+    wall_time = time.perf_counter() - started
+
+    latencies_ms = np.asarray(latencies) * 1000
+    stats = {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "wall_time_s": round(wall_time, 4),
+        "throughput_rps": round(n_requests / wall_time, 2),
+        "mean_ms": round(float(latencies_ms.mean()), 4),
+        "max_ms": round(float(latencies_ms.max()), 4),
+    }
+    for p, value in zip(PERCENTILES, np.percentile(latencies_ms, PERCENTILES)):
+        stats[f"p{p}_ms"] = round(float(value), 4)
+    return stats
+
+
+# === Synthetic Models ===
+def synthetic_scorer(dataset, seed, n_factors=100):
+    """An SVDScorer with random factors; serving cost does not depend on the factor values."""
+    rng = np.random.default_rng(seed)
+    user_ids = dataset["user_features"]["user_id"].to_numpy()
+    item_ids = dataset["items"]["item_id"].to_numpy()
+    interactions = dataset["interactions"]
+
+    # Training ratings in CSR layout, as from_surprise stores them (needed by fold_in)
+    user_codes = pd.Index(user_ids).get_indexer(interactions["user_id"])
+    item_codes = pd.Index(item_ids).get_indexer(interactions["item_id"])
+    ratings = 1 + 4 * interactions["interaction"].rank(pct=True).to_numpy()
+    order = np.argsort(user_codes, kind="stable")
+    indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(user_codes, minlength=len(user_ids)), out=indptr[1:])
+
+    return SVDScorer(
+        pu=rng.normal(0, 0.1, (len(user_ids), n_factors)),
+        qi=rng.normal(0, 0.1, (len(item_ids), n_factors)),
+        bu=rng.normal(0, 0.1, len(user_ids)),
+        bi=rng.normal(0, 0.1, len(item_ids)),
+        global_mean=ratings.mean(),
+        rating_scale=(1, 5),
+        user_raw_ids=user_ids,
+        item_raw_ids=item_ids,
+        user_ratings={"indptr": indptr, "items": item_codes[order], "ratings": ratings[order]},
+    )
+
+
+def synthetic_content_model(items_df):
+    tfidf, tfidf_matrix = train_content(items_df.copy())
+    return prepare_cb_model({"hotels_df": items_df, "tfidf_model": tfidf, "tfidf_matrix": tfidf_matrix})
+
+
+def synthetic_cluster_tables(dataset, seed, n_clusters=5):
+    # Random assignments: serving is two lookups whatever produced the clusters
+    rng = np.random.default_rng(seed)
+    users = dataset["user_features"][["user_id"]].assign(cluster=rng.integers(0, n_clusters, len(dataset["user_features"])))
+    return ClusterTables.from_assignments(users, dataset["interactions"])
+
+
+def install(dataset, seed):
+    """Point the registry at the synthetic dataset and drop anything already loaded."""
+    registry.register("destinations", lambda: dataset["catalog"])
+    registry.register("interactions", lambda: dataset["interactions"])
+    registry.register("user_features", lambda: dataset["user_features"])
+    registry.register("svd_scorer", lambda: synthetic_scorer(dataset, seed))
+    registry.register("content_based_model", lambda: synthetic_content_model(dataset["items"]))
+    registry.register("cluster_tables", lambda: synthetic_cluster_tables(dataset, seed))
+    registry.reload()
+
+    names = ["item_index", "interaction_index", "svd_scorer", "svd_vector_index", "content_fallback",
+             "content_based_model", "cluster_tables"]
+    errors = registry.preload(names)
+    if errors:
+        raise RuntimeError(f"Failed to load synthetic models: {errors}")
+    status = registry.status()
+    return {name: status[name]["load_time_ms"] for name in names}
+
+
+# === Benchmarks ===
+def run_scale(name, params, n_requests, concurrency, seed):
+    print(f"\n=== {name}: {params} ===")
+    started = time.perf_counter()
+    dataset = generate(**params, seed=seed)
+    generate_time = time.perf_counter() - started
+    load_times = install(dataset, seed)
+
+    rng = np.random.default_rng(seed)
+    users = dataset["user_features"]["user_id"].to_numpy()
+    items = dataset["items"]["item_id"].to_numpy()
+    vocabulary = sorted({a.strip() for tags in dataset["catalog"]["activities"] for a in tags.split(",")})
+    accommodation_types = dataset["items"]["accommodation_type"].unique()
+    max_price = float(dataset["items"]["price"].max())
+
+    request_users = rng.choice(users, n_requests)
+    request_items = rng.choice(items, n_requests)
+    # Distinct budgets so hybrid requests miss the result cache, as most real requests do
+    request_budgets = rng.uniform(0.2, 1.0, n_requests) * max_price
+    request_activities = [", ".join(rng.choice(vocabulary, rng.integers(1, 3), replace=False)) for _ in range(n_requests)]
+    request_types = [t if rng.random() < 0.5 else None for t in rng.choice(accommodation_types, n_requests)]
+    request_ratings = rng.integers(1, 6, n_requests).astype(float)
+
+    content_fallback = registry.get("content_fallback")
+    cb_model = registry.get("content_based_model")
+    cluster_tables = registry.get("cluster_tables")
+    sample_recs = [{"item_id": item, "destination": "Synthetic", "predicted_rating": 3.5} for item in items[:10]]
+
+    def flush_history():
+        history_sink.flush()
+
+    calls = {
+        "hybrid_recommend": (
+            lambda i: hybrid_recommend(request_users[i], request_budgets[i], activities=request_activities[i] if i % 4 == 0 else None,
+                                       accommodation_type=request_types[i]),
+            None,
+        ),
+        "fallback_content_based": (lambda i: content_fallback.recommend(request_activities[i], request_budgets[i]), None),
+        "get_cb_recommendations": (lambda i: get_cb_recommendations(request_items[i], 10, cb_model), None),
+        "get_user_cluster_recommendations": (
+            lambda i: get_user_cluster_recommendations(request_users[i], 10, cluster_tables), None,
+        ),
+        "save_recommendation_history": (lambda i: save_recommendation_history(request_users[i], sample_recs), flush_history),
+        "hybrid_save_history": (lambda i: HybridRecommender.save_history(request_users[i], sample_recs), flush_history),
+        # Last: it changes the interaction index, SVD factors and cluster counts the others read
+        "store_rating": (lambda i: store_rating(request_users[i], request_items[i], request_ratings[i]), None),
+    }
+
+    results = {}
+    for benchmark in BENCHMARKS:
+        call, finish = calls[benchmark]
+        clear_all()
+        results[benchmark] = measure(call, n_requests, concurrency=concurrency, finish=finish)
+        stats = results[benchmark]
+        print(f"{benchmark:<34}{stats['throughput_rps']:>12.1f} req/s   p50 {stats['p50_ms']:.3f} ms   "
+              f"p95 {stats['p95_ms']:.3f} ms   p99 {stats['p99_ms']:.3f} ms")
+
+    return {
+        "params": params,
+        "generate_time_s": round(generate_time, 4),
+        "load_times_ms": load_times,
+        "benchmarks": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """p95 latency changes against a baseline run; returns the regressions beyond ``threshold``."""
+    regressions = []
+    print(f"\n=== p95 vs baseline ({baseline.get('git_commit') or 'unknown commit'}) ===")
+    for scale, result in current["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        for benchmark, stats in result["benchmarks"].items():
+            before = previous["benchmarks"].get(benchmark, {}).get("p95_ms")
+            if not before:
+                continue
+            change = stats["p95_ms"] / before - 1
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"{scale:<8}{benchmark:<34}{before:>10.3f} -> {stats['p95_ms']:.3f} ms ({change:+.1%}){flag}")
+            if flag:
+                regressions.append((scale, benchmark, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the recommender paths on synthetic data.")
+    parser.add_argument("--scales", default="small,medium", help=f"comma-separated, from: {', '.join(SCALES)}")
+    parser.add_argument("--requests", type=int, default=1000, help="calls per path and scale")
+    parser.add_argument("--concurrency", type=int, default=1, help="threads issuing calls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="earlier results JSON to compare p95 latency against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 increase counted as a regression")
+    args = parser.parse_args(argv)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scale(s): {', '.join(unknown)}")
+
+    results = {
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "scales": {scale: run_scale(scale, SCALES[scale], args.requests, args.concurrency, args.seed) for scale in scales},
+    }
+    ratings_store.close()
+    history_sink.close()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results", f"{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
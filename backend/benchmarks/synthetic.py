@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.data.cleaning import make_item_id
+
+ACCOMMODATION_TYPES = ["Hotel", "Hostel", "Resort", "Villa", "Airbnb", "Vacation rental", "Guesthouse", "Riad"]
+GENDERS = ["Male", "Female"]
+NATIONALITIES = ["American", "British", "Canadian", "Korean", "Japanese", "German", "French", "Brazilian",
+                 "Indian", "Australian", "Spanish", "Italian", "Mexican", "Chinese", "Dutch"]
+WEATHER = ["hot", "warm", "mild", "cold", "rainy"]
+BASE_ACTIVITIES = ["beach", "hiking", "museums", "nightlife", "food", "shopping", "skiing", "diving",
+                   "safari", "wine", "history", "surfing", "temples", "festivals", "cycling", "spa"]
+
+# Named scales for the benchmark runner
+SCALES = {
+    "small": {"n_users": 1_000, "n_items": 500, "n_interactions": 20_000, "n_activities": 16},
+    "medium": {"n_users": 20_000, "n_items": 5_000, "n_interactions": 400_000, "n_activities": 64},
+    "large": {"n_users": 200_000, "n_items": 50_000, "n_interactions": 4_000_000, "n_activities": 256},
+}
+
+
+# === Synthetic Travel Data ===
+def activity_vocabulary(n_activities):
+    extra = [f"activity {i}" for i in range(max(0, n_activities - len(BASE_ACTIVITIES)))]
+    return (BASE_ACTIVITIES + extra)[:n_activities]
+
+
+def generate(n_users, n_items, n_interactions, n_activities=16, seed=0):
+    """Synthetic tables with the schemas of the cleaned training CSVs.
+
+    Returns a dict with ``items`` (cleaned_items.csv), ``interactions``
+    (cleaned_interactions.csv), ``user_features`` (user_features.csv) and
+    ``catalog``, the items plus the ``activities`` and ``weather`` columns
+    the hybrid filters use. Item popularity follows a Zipf-like curve so
+    a few items receive most interactions, as in real booking data.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Items: every accommodation type at each destination until n_items are made
+    n_destinations = -(-n_items // len(ACCOMMODATION_TYPES))
+    destinations = np.array([f"City {i}, Country {i % 97}" for i in range(n_destinations)], dtype=object)
+    item_destinations = np.repeat(destinations, len(ACCOMMODATION_TYPES))[:n_items]
+    item_types = np.tile(np.array(ACCOMMODATION_TYPES, dtype=object), n_destinations)[:n_items]
+    items = pd.DataFrame({"destination": item_destinations, "accommodation_type": item_types})
+    items.insert(0, "item_id", make_item_id(items["destination"], items["accommodation_type"]))
+    items["price"] = rng.lognormal(mean=6.5, sigma=0.6, size=n_items).round()
+
+    vocabulary = np.array(activity_vocabulary(n_activities), dtype=object)
+    n_tags = rng.integers(1, min(4, n_activities) + 1, size=n_items)
+    activities = [", ".join(rng.choice(vocabulary, size=k, replace=False)) for k in n_tags]
+    catalog = items.assign(activities=activities, weather=rng.choice(WEATHER, size=n_items))
+
+    user_ids = np.array([f"User {i}" for i in range(n_users)], dtype=object)
+    user_features = pd.DataFrame({
+        "user_id": user_ids,
+        "age": rng.integers(18, 75, size=n_users).astype(float),
+        "gender": rng.choice(GENDERS, size=n_users),
+        "nationality": rng.choice(NATIONALITIES, size=n_users),
+    })
+
+    # Zipf-like item popularity, uniform user activity
+    popularity = 1.0 / np.arange(1, n_items + 1) ** 0.8
+    item_positions = rng.choice(n_items, size=n_interactions, p=popularity / popularity.sum())
+    user_positions = rng.integers(0, n_users, size=n_interactions)
+    transport_cost = rng.lognormal(mean=6.0, sigma=0.5, size=n_interactions).round()
+    interactions = pd.DataFrame({
+        "user_id": user_ids[user_positions],
+        "item_id": items["item_id"].to_numpy()[item_positions],
+        "interaction": items["price"].to_numpy()[item_positions] + transport_cost,
+    })
+
+    return {"items": items, "interactions": interactions, "user_features": user_features, "catalog": catalog}
+
+
+def write_csvs(dataset, directory):
+    """Write the tables under the file names the training scripts read."""
+    os.makedirs(directory, exist_ok=True)
+    file_names = {
+        "items": "cleaned_items.csv",
+        "interactions": "cleaned_interactions.csv",
+        "user_features": "user_features.csv",
+        "catalog": "catalog.csv",
+    }
+    for key, file_name in file_names.items():
+        dataset[key].to_csv(os.path.join(directory, file_name), index=False)
+    return directory
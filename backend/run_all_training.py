@@ -1,28 +1,62 @@
-import subprocess
-import sys
+import argparse
 import os
+import sys
 
-def run_script(script_path):
-    print(f"\n🚀 Running {script_path} ...")
-    try:
-        subprocess.run([sys.executable, script_path], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running {script_path}:")
-        print(e)
-    else:
-        print("✅ Done.")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from app.data.training_interactions import RATINGS_EXPORT_PATH, export_ratings
+from app.train.pipeline import Pipeline, Stage, format_report
 
-if __name__ == "__main__":
-    print("🧠 Starting full model training pipeline...")
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+DATA_DIR = os.path.join(APP_DIR, "data")
+MODEL_DIR = os.path.join(APP_DIR, "models")
+PIPELINE_DIR = os.path.join(DATA_DIR, "pipeline")
+STATE_PATH = os.path.join(PIPELINE_DIR, "state.json")
 
-    base_path = os.path.join("app", "train")
-    scripts = [
-        "clean_feature_hybrid.py",
-        "train_content.py",
-        "train_collaborative.py"
-    ]
+CLEANED_FRAME = os.path.join(PIPELINE_DIR, "cleaned_feature_hybrid_dataset")
+RATINGS_FRAME = os.path.join(PIPELINE_DIR, "cleaned_ratings_data")
 
-    for script in scripts:
-        run_script(os.path.join(base_path, script))
+# Inputs/outputs are passed to the stage functions as keyword arguments; the
+# cleaned data moves between stages as columnar frame artifacts, not CSV.
+STAGES = [
+    Stage(
+        "clean",
+        "app.train.clean_feature_hybrid:clean_feature_hybrid",
+        inputs={"input_path": os.path.join(DATA_DIR, "feature_hybrid_dataset.csv")},
+        outputs={"output_path": os.path.join(DATA_DIR, "cleaned_feature_hybrid_dataset.csv"), "frame_path": CLEANED_FRAME},
+    ),
+    Stage(
+        "ratings",
+        "app.data.cleanup_dataset:cleanup_dataset",
+        inputs={"input_path": CLEANED_FRAME, "ratings_path": RATINGS_EXPORT_PATH},
+        outputs={"output_path": RATINGS_FRAME},
+    ),
+    Stage(
+        "content",
+        "app.train.train_content:train_content",
+        inputs={"data_path": RATINGS_FRAME},
+        outputs={"model_path": os.path.join(MODEL_DIR, "content_model")},
+    ),
+    Stage(
+        "collaborative",
+        "app.train.train_collaborative:train_collaborative",
+        inputs={"data_path": RATINGS_FRAME},
+        outputs={"model_path": os.path.join(MODEL_DIR, "svd_model")},
+    ),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the model training pipeline.")
+    parser.add_argument("--force", action="store_true", help="retrain every stage even if its inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None, help="max stages running at once")
+    args = parser.parse_args()
+
+    print("🧠 Starting full model training pipeline...")
+    # Ratings stored through the API join the training data; stages re-run only if the export changed
+    print(f"Exported stored ratings through id {export_ratings()}.")
+    results = Pipeline(STAGES, STATE_PATH, max_workers=args.workers).run(force=args.force)
 
+    print("\n" + format_report(results))
+    if any(result["status"] in ("failed", "blocked") for result in results.values()):
+        print("\n❌ Training pipeline finished with failures.")
+        sys.exit(1)
     print("\n🏁 Training pipeline completed.")
@@ -1,11 +1,15 @@
 import pandas as pd
 import os
+import sys
 
 # Set up proper data path
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(ROOT_DIR, "backend", "app", "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+from app.data.cleaning import make_item_id
+
 df = pd.read_csv("Travel details dataset.csv")
 
 interactions = df[[
@@ -17,7 +21,7 @@ interactions = df[[
 ]].copy()
 
 # Create item_id and rename user_id
-interactions['item_id'] = interactions.apply(lambda row: f"{row['Destination']}_{row['Accommodation type']}", axis=1)
+interactions['item_id'] = make_item_id(interactions['Destination'], interactions['Accommodation type'])
 interactions['user_id'] = interactions['Traveler name']
 
 # Calculate interaction value (total cost)
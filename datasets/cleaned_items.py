@@ -1,11 +1,15 @@
 import pandas as pd
 import os
+import sys
 
 # Set up proper data path
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(ROOT_DIR, "backend", "app", "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+from app.data.cleaning import make_item_id
+
 # Load and clean
 df = pd.read_csv("Travel details dataset.csv")
 
@@ -16,7 +20,7 @@ items = df[['Destination', 'Accommodation type', 'Accommodation cost']].drop_dup
 })
 
 # Add item_id
-items['item_id'] = items.apply(lambda row: f"{row['destination']}_{row['accommodation_type']}", axis=1)
+items['item_id'] = make_item_id(items['destination'], items['accommodation_type'])
 items = items[['item_id', 'destination', 'accommodation_type', 'price']]
 
 # Save